@@ -0,0 +1,50 @@
+"""
+Compiled kernels for the audio callback hot path.
+
+numba is optional: when it isn't installed NUMBA_AVAILABLE is False and the
+recorder keeps using its NumPy implementation. With numba, the downmix and the
+level RMS are computed in one pass over the block with no temporary arrays,
+which matters for small block sizes where per-call NumPy overhead dominates.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _rms_and_downmix(indata: np.ndarray, out_mono: np.ndarray) -> float:
+    """
+    Average the channels of `indata` (frames x channels) into `out_mono` and
+    return the RMS of that downmix, matching AudioRecorder._block_rms.
+    """
+    n = indata.shape[0]
+    c = indata.shape[1]
+    ssq = 0.0
+    for i in range(n):
+        s = 0.0
+        for j in range(c):
+            s += float(indata[i, j])
+        m = s / c
+        out_mono[i] = m
+        ssq += m * m
+    if n == 0:
+        return 0.0
+    return math.sqrt(ssq / n)
+
+
+if NUMBA_AVAILABLE:
+    rms_and_downmix = njit(cache=True, fastmath=True)(_rms_and_downmix)
+else:
+    rms_and_downmix = _rms_and_downmix
+
+
+def warm_up(channels: int, dtype: str) -> None:
+    """Compile the kernel for this stream layout before the audio callback first needs it"""
+    if NUMBA_AVAILABLE:
+        rms_and_downmix(np.zeros((1, channels), dtype=dtype), np.zeros(1, dtype=dtype))
@@ -1,7 +1,83 @@
 import re
-from typing import List, Dict, Optional, NamedTuple
+import time
+from functools import lru_cache
+from typing import List, Dict, Optional, NamedTuple, Any, Tuple
 import sounddevice as sd
 
+# Enumerating devices through PortAudio is slow on Windows (WASAPI probes each
+# endpoint), so results are cached for a short window. Call
+# invalidate_device_cache() to force a fresh enumeration.
+_CACHE_TTL = 5.0
+_DEVICES_CACHE: Dict[str, Any] = {
+    't': 0.0,
+    'devices': None,
+    'hostapis': None,
+    'identifier_index': None,
+    'input_devices': None,
+    'default_input_id': None,
+}
+
+# Host API name fragment -> priority (higher is better), checked in this order.
+# 'ks' catches "Windows WDM-KS".
+_API_PRIORITY = {
+    'wasapi': 400,
+    'directsound': 300,
+    'mme': 200,
+    'ks': 100,
+}
+
+# System virtual devices (stereo mix, loopback, etc.)
+_VIRTUAL_PATTERNS = ('stereo mix', 'system virtual', 'loopback', 'what u hear', 'wave out mix')
+# WDM-KS raw channel endpoints, e.g. "Microphone 1 (Device)"
+_MIC_NUM_RE = re.compile(r'microphone \d+ \(')
+# Common device name shape: "<prefix> (<word> <word> ...)" with an optional closing paren.
+# Captures everything up to the last '(' plus the first two words inside it.
+_NORM_RE = re.compile(
+    r'^(?P<prefix>.*\()\s*(?P<w1>[^\s()]+)(?:\s+(?P<w2>[^\s()]+))?(?:\s+[^\s()]+)*\s*\)?$'
+)
+
+def _cache_is_stale() -> bool:
+    return time.monotonic() - _DEVICES_CACHE['t'] >= _CACHE_TTL
+
+def _cached_query_devices():
+    """Returns sd.query_devices(), reusing the result within the cache TTL"""
+    if _DEVICES_CACHE['devices'] is None or _cache_is_stale():
+        _DEVICES_CACHE['devices'] = sd.query_devices()
+        _DEVICES_CACHE['hostapis'] = None
+        _DEVICES_CACHE['identifier_index'] = None
+        _DEVICES_CACHE['input_devices'] = None
+        _DEVICES_CACHE['default_input_id'] = None
+        _DEVICES_CACHE['t'] = time.monotonic()
+    return _DEVICES_CACHE['devices']
+
+def _cached_query_hostapis():
+    """Returns sd.query_hostapis(), reusing the result within the cache TTL"""
+    _cached_query_devices()  # Shares the device timestamp, clears hostapis when stale
+    if _DEVICES_CACHE['hostapis'] is None:
+        _DEVICES_CACHE['hostapis'] = sd.query_hostapis()
+    return _DEVICES_CACHE['hostapis']
+
+def _identifier_index() -> Dict['DeviceIdentifier', Dict[str, Any]]:
+    """Maps DeviceIdentifier -> device for get_input_devices(), rebuilt with the device cache"""
+    _cached_query_devices()  # Clears the index when the enumeration is stale
+    if _DEVICES_CACHE['identifier_index'] is None:
+        index: Dict[DeviceIdentifier, Dict[str, Any]] = {}
+        for device in get_input_devices():
+            index.setdefault(create_device_identifier(device), device)  # First match wins
+        _DEVICES_CACHE['identifier_index'] = index
+    return _DEVICES_CACHE['identifier_index']
+
+def invalidate_device_cache() -> None:
+    """Drops cached device enumeration so the next query hits PortAudio again"""
+    _DEVICES_CACHE['t'] = 0.0
+    _DEVICES_CACHE['devices'] = None
+    _DEVICES_CACHE['hostapis'] = None
+    _DEVICES_CACHE['identifier_index'] = None
+    _DEVICES_CACHE['input_devices'] = None
+    _DEVICES_CACHE['default_input_id'] = None
+    _get_host_api_priority.cache_clear()
+    _normalize_device_name.cache_clear()
+
 class DeviceIdentifier(NamedTuple):
     """Unique identifier for an audio device that persists across sessions"""
     name: str
@@ -21,40 +97,42 @@ def find_device_by_identifier(identifier: DeviceIdentifier) -> Optional[Dict[str
     Finds the best matching device for a saved identifier.
     Prioritizes WASAPI variants for reliability.
     """
-    devices = get_input_devices()
-
     # First try exact match
-    for device in devices:
-        if create_device_identifier(device) == identifier:
-            return device
+    device = _identifier_index().get(identifier)
+    if device is not None:
+        return device
 
-    # Fall back to name match, preferring WASAPI variants
+    devices = get_input_devices()
     normalized_target = _normalize_device_name(identifier.name)
-    matching_devices = []
-    
+
+    # Fall back to name match, preferring WASAPI variants.
+    # Track the best candidate inline by: API priority (WASAPI first) > sample rate > channels
+    best_device = None
+    best_key = None
+
     for d in devices:
-        normalized_name = _normalize_device_name(d['name'])
         # Match either exact name or normalized name
-        if d['name'] == identifier.name or normalized_name == normalized_target:
-            matching_devices.append(d)
-    
-    if not matching_devices:
-        return None
-    
-    # Sort by: API priority (WASAPI first) > sample rate > channels
-    def sort_key(d):
-        return (
+        if d['name'] != identifier.name and _normalize_device_name(d['name']) != normalized_target:
+            continue
+
+        key = (
             _get_host_api_priority(d['hostapi']),
             d['default_samplerate'],
             d['max_input_channels']
         )
-    
-    return max(matching_devices, key=sort_key)
+        if best_key is None or key > best_key:
+            best_device, best_key = d, key
+
+    return best_device
 
 def get_device_by_id(device_id: int) -> Optional[Dict[str, any]]:
     """Gets device info by ID, returns None if device not found"""
     try:
-        device = sd.query_devices(device_id)
+        devices = _cached_query_devices()
+        # Plain indexing would accept negative IDs (e.g. -1 for "no default device")
+        if not 0 <= device_id < len(devices):
+            return None
+        device = devices[device_id]
         if device['max_input_channels'] > 0:
             return {
                 'id': device_id,
@@ -67,6 +145,7 @@ def get_device_by_id(device_id: int) -> Optional[Dict[str, any]]:
     except:
         return None
 
+@lru_cache(maxsize=256)
 def _normalize_device_name(name: str) -> str:
     """
     Normalize device names to catch variants with truncation or slight differences.
@@ -81,6 +160,12 @@ def _normalize_device_name(name: str) -> str:
     """
     normalized = name.strip()
 
+    # Fast path: one regex pass handles the usual "Name (Vendor Model ...)" shape
+    m = _NORM_RE.match(normalized)
+    if m:
+        w2 = m.group('w2')
+        return f"{m.group('prefix')}{m.group('w1')} {w2}" if w2 else f"{m.group('prefix')}{m.group('w1')}"
+
     # Find the last opening parenthesis
     if '(' in normalized:
         last_paren = normalized.rfind('(')
@@ -109,25 +194,21 @@ def _normalize_device_name(name: str) -> str:
 
     return normalized
 
+@lru_cache(maxsize=16)
 def _get_host_api_priority(hostapi_index: int) -> int:
     """
     Return priority score for host API (higher is better).
     WASAPI is most reliable on modern Windows, followed by DirectSound, MME, then WDM-KS.
+    Cached per index since there are only a handful of host APIs.
     """
     try:
-        api_info = sd.query_hostapis(hostapi_index)
+        api_info = _cached_query_hostapis()[hostapi_index]
         api_name = api_info['name'].lower()
-        
-        if 'wasapi' in api_name:
-            return 400
-        elif 'directsound' in api_name:
-            return 300
-        elif 'mme' in api_name:
-            return 200
-        elif 'wdm-ks' in api_name or 'ks' in api_name:
-            return 100
-        else:
-            return 50
+
+        for fragment, priority in _API_PRIORITY.items():
+            if fragment in api_name:
+                return priority
+        return 50
     except:
         return 0
 
@@ -142,18 +223,12 @@ def _is_problematic_endpoint(name: str, hostapi_index: int) -> bool:
         return True
     
     # System virtual devices (stereo mix, loopback, etc.)
-    if any(pattern in name_lower for pattern in [
-        'stereo mix',
-        'system virtual',
-        'loopback',
-        'what u hear',
-        'wave out mix'
-    ]):
+    if any(pattern in name_lower for pattern in _VIRTUAL_PATTERNS):
         return True
     
     # WDM-KS raw channel endpoints (use the aggregate instead)
     # e.g., "Microphone 1 (Device)", "Microphone 2 (Device)", "Microphone 3 (Device)"
-    if re.match(r'microphone \d+ \(', name_lower):
+    if _MIC_NUM_RE.match(name_lower):
         return True
     
     return False
@@ -170,108 +245,85 @@ def get_input_devices() -> List[Dict[str, any]]:
     4. Filtering out problematic virtual/processing endpoints
     5. Choosing variants with best sample rate when channels and API are equal
     """
-    all_devices = sd.query_devices()
-    seen_devices: Dict[str, Dict] = {}  # Track by normalized name
-    
-    # Collect all input devices with metadata
-    candidates = []
-    for i in range(len(all_devices)):
-        device = all_devices[i]
-        if device['max_input_channels'] > 0:
-            name = device['name']
-            normalized_name = _normalize_device_name(name)
-            
-            # Skip problematic endpoints
-            if _is_problematic_endpoint(name, device['hostapi']):
-                continue
-            
-            device_info = {
-                'id': i,
-                'name': name,
-                'normalized_name': normalized_name,
-                'max_input_channels': device['max_input_channels'],
-                'hostapi': device['hostapi'],
-                'default_samplerate': device['default_samplerate'],
-                'api_priority': _get_host_api_priority(device['hostapi'])
-            }
-            candidates.append(device_info)
-    
-    # For each normalized name, pick the best variant
-    for device_info in candidates:
-        normalized_name = device_info['normalized_name']
-
-        if normalized_name not in seen_devices:
-            seen_devices[normalized_name] = device_info
-        else:
-            existing = seen_devices[normalized_name]
-
-            # IMPORTANT: Prefer devices with more channels first
-            # 1-channel devices are often problematic/non-functional
-            # Priority: channel count > API priority > sample rate
-            current_channels = device_info['max_input_channels']
-            existing_channels = existing['max_input_channels']
-
-            is_better = (
-                # Prefer more channels (3-channel over 1-channel, etc.)
-                current_channels > existing_channels or
-                # If same channel count, prefer better API
-                (current_channels == existing_channels and
-                 device_info['api_priority'] > existing['api_priority']) or
-                # If same channel and API, prefer higher sample rate
-                (current_channels == existing_channels and
-                 device_info['api_priority'] == existing['api_priority'] and
-                 device_info['default_samplerate'] > existing['default_samplerate'])
-            )
-
-            if is_better:
-                seen_devices[normalized_name] = device_info
-    
-    # Remove internal metadata and return
-    result = []
-    for device in seen_devices.values():
-        result.append({
-            'id': device['id'],
+    _cached_query_devices()  # Clears the deduplicated list when the enumeration is stale
+    if _DEVICES_CACHE['input_devices'] is None:
+        _DEVICES_CACHE['input_devices'] = _scan_input_devices()
+    return list(_DEVICES_CACHE['input_devices'])  # Callers may sort or filter their copy
+
+def _variant_info(device_id: int, device: Dict[str, any]) -> Dict[str, any]:
+    """Variant entry as reported by get_all_device_variants"""
+    return {
+        'id': device_id,
+        'name': device['name'],
+        'channels': device['max_input_channels'],
+        'hostapi': device['hostapi'],
+        'default_samplerate': device['default_samplerate']
+    }
+
+def _scan_input_devices() -> List[Dict[str, any]]:
+    """Deduplicating scan behind get_input_devices()"""
+    # Best variant per normalized name: (rank, id, device). Tuples compare in C, and
+    # the output dicts are only built for the winners.
+    best: Dict[str, Tuple[Tuple[int, int, float], int, Any]] = {}
+
+    for i, device in enumerate(_cached_query_devices()):
+        channels = device['max_input_channels']
+        if channels <= 0:
+            continue
+
+        name = device['name']
+
+        # Skip problematic endpoints
+        if _is_problematic_endpoint(name, device['hostapi']):
+            continue
+
+        # IMPORTANT: Prefer devices with more channels first
+        # 1-channel devices are often problematic/non-functional
+        # Priority: channel count > API priority > sample rate
+        rank = (channels, _get_host_api_priority(device['hostapi']), device['default_samplerate'])
+
+        normalized_name = _normalize_device_name(name)
+        existing = best.get(normalized_name)
+        if existing is None or rank > existing[0]:
+            best[normalized_name] = (rank, i, device)
+
+    return [
+        {
+            'id': i,
             'name': device['name'],
             'max_input_channels': device['max_input_channels'],
             'hostapi': device['hostapi'],
             'default_samplerate': device['default_samplerate']
-        })
-    
-    return result
+        }
+        for _, i, device in best.values()
+    ]
 
 def get_default_device_id() -> int:
     """Returns the system default input device ID"""
-    device = sd.query_devices(None, kind='input')
-    return device['index']
+    _cached_query_devices()  # Clears the cached default when the enumeration is stale
+    if _DEVICES_CACHE['default_input_id'] is None:
+        device = sd.query_devices(None, kind='input')
+        _DEVICES_CACHE['default_input_id'] = device['index']
+    return _DEVICES_CACHE['default_input_id']
 
 def set_input_device(device_id: int) -> None:
     """Sets the active input device for recording"""
     sd.default.device[0] = device_id  # Sets input device only
+    _DEVICES_CACHE['default_input_id'] = None  # query_devices(kind='input') follows sd.default
 
 def get_all_device_variants() -> Dict[str, List[Dict[str, any]]]:
     """Returns all variants of input devices grouped by device name"""
     device_groups: Dict[str, List[Dict]] = {}
 
-    for i, device in enumerate(sd.query_devices()):
+    for i, device in enumerate(_cached_query_devices()):
         if device['max_input_channels'] > 0:
-            original_name = device['name']
-
-            if original_name not in device_groups:
-                device_groups[original_name] = []
-
-            device_groups[original_name].append({
-                'id': i,
-                'name': original_name,
-                'channels': device['max_input_channels'],
-                'hostapi': device['hostapi'],
-                'default_samplerate': device['default_samplerate']
-            })
+            device_groups.setdefault(device['name'], []).append(_variant_info(i, device))
 
     return device_groups
 
 def is_valid_device_id(device_id: int) -> bool:
-    """Checks if a device ID exists in the current device list"""
-    return any(device['id'] == device_id for device in get_input_devices())
+    """Checks if a device ID refers to an input-capable device (single lookup, no dedup pass)"""
+    return get_device_by_id(device_id) is not None
 
 if __name__ == '__main__':
     print("Available Input Devices (Grouped):")
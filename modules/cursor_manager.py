@@ -6,6 +6,7 @@ Uses Windows API through ctypes to temporarily change the cursor.
 """
 
 import ctypes
+from ctypes import wintypes
 import logging
 from typing import Optional
 import atexit
@@ -21,6 +22,7 @@ IDC_HAND = 32649       # Hand cursor
 # Windows API constants
 IMAGE_CURSOR = 2
 LR_SHARED = 0x8000
+SPI_SETCURSORS = 0x0057
 
 
 class CursorManager:
@@ -31,6 +33,13 @@ class CursorManager:
         self.original_cursor: Optional[int] = None
         self.cursor_changed: bool = False
         self._user32 = ctypes.windll.user32
+        self._declare_signatures()
+
+        # Load the shared AppStarting cursor once; it is owned by the system and
+        # reused for every recording (only the per-call copy is handed to SetSystemCursor)
+        self._recording_cursor_handle: Optional[int] = self._user32.LoadCursorW(None, IDC_APPSTARTING)
+        if not self._recording_cursor_handle:
+            logger.warning("Failed to load recording cursor")
 
         # Register cleanup on exit
         atexit.register(self._cleanup)
@@ -38,6 +47,21 @@ class CursorManager:
         # Save the original cursor immediately
         self._save_original_cursor()
 
+    def _declare_signatures(self) -> None:
+        """Declare argument/return types so ctypes passes handles as pointers, not ints."""
+        u = self._user32
+        # lpCursorName is a MAKEINTRESOURCE integer here, so it's declared as a pointer
+        u.LoadCursorW.argtypes = [wintypes.HINSTANCE, wintypes.LPVOID]
+        u.LoadCursorW.restype = wintypes.HANDLE
+        u.CopyImage.argtypes = [wintypes.HANDLE, wintypes.UINT, ctypes.c_int, ctypes.c_int, wintypes.UINT]
+        u.CopyImage.restype = wintypes.HANDLE
+        u.SetSystemCursor.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        u.SetSystemCursor.restype = wintypes.BOOL
+        u.DestroyCursor.argtypes = [wintypes.HANDLE]
+        u.DestroyCursor.restype = wintypes.BOOL
+        u.SystemParametersInfoW.argtypes = [wintypes.UINT, wintypes.UINT, wintypes.LPVOID, wintypes.UINT]
+        u.SystemParametersInfoW.restype = wintypes.BOOL
+
     def _save_original_cursor(self) -> None:
         """Save the current system cursor for later restoration."""
         try:
@@ -67,13 +91,11 @@ class CursorManager:
             return
 
         try:
-            # Load the AppStarting cursor (arrow with small hourglass)
-            recording_cursor = self._user32.LoadCursorW(None, IDC_APPSTARTING)
-
-            if recording_cursor:
-                # Set it as the system arrow cursor
+            if self._recording_cursor_handle:
+                # Set it as the system arrow cursor. SetSystemCursor takes ownership of
+                # (and later destroys) the handle it is given, so it gets a fresh copy.
                 result = self._user32.SetSystemCursor(
-                    self._user32.CopyImage(recording_cursor, IMAGE_CURSOR, 0, 0, LR_SHARED),
+                    self._user32.CopyImage(self._recording_cursor_handle, IMAGE_CURSOR, 0, 0, LR_SHARED),
                     IDC_ARROW
                 )
 
@@ -97,7 +119,7 @@ class CursorManager:
         try:
             # The easiest way to restore cursors is to reload them from system
             # This works because we're using standard Windows cursors
-            self._user32.SystemParametersInfoW(0x0057, 0, None, 0)  # SPI_SETCURSORS
+            self._user32.SystemParametersInfoW(SPI_SETCURSORS, 0, None, 0)
             self.cursor_changed = False
             logger.info("Cursor restored to default")
 
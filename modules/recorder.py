@@ -1,4 +1,6 @@
+import math
 import threading
+from collections import deque
 from typing import Optional, Callable, Tuple, Any
 import time
 
@@ -7,6 +9,7 @@ import sounddevice as sd
 import soundfile as sf
 
 from modules.settings import Settings
+from modules._audio_kernels import NUMBA_AVAILABLE, rms_and_downmix, warm_up
 
 # NOTE: Optimized settings for speech recording
 # - 16kHz sample rate is optimal for STT, using 22.05kHz for safety margin
@@ -26,6 +29,11 @@ SILENCE_THRESHOLD = settings.get('silence_threshold')
 MIN_DURATION = 1.0
 # Time of continuous silence (in seconds) before auto-stopping
 DEFAULT_SILENT_START_TIMEOUT = 4.0
+# Sample rate for both the input stream and the saved WAV
+SAMPLE_RATE = 22050
+# Sample format delivered by the input stream. int16 matches the PCM_16 file, so blocks
+# are written without a float->int conversion and the callback moves half the bytes.
+STREAM_DTYPE = 'int16'
 
 class AudioRecorder:
     # Controls how smooth/reactive the audio level indicator bar appears in the UI
@@ -33,36 +41,61 @@ class AudioRecorder:
     # 0.2 provides a good balance between smoothness and responsiveness
     SMOOTHING_FACTOR = 0.2
 
+    # Messages for events queued by the audio callback and printed from the recording thread.
+    # print() takes the stdout lock, which must not happen inside the PortAudio callback.
+    EVENT_MESSAGES = {
+        'status': "Audio callback status: {0}",
+        'silence_start': "Initial silence detected (RMS: {0:.6f} < {1}, dB: {2:.1f})",
+        'silence_timeout': "Stopping due to {0}s of initial silence (RMS: {1:.6f})",
+        'sound_detected': "Sound detected! (RMS: {0:.6f} >= {1}, dB: {2:.1f})",
+        'callback_error': "Audio callback error: {0}",
+    }
+
     def __init__(self, filename: str = 'temp_audio.wav',
                  level_callback: Optional[Callable[[float], None]] = None,
                  silent_start_timeout: Optional[float] = None) -> None:
         self.filename = filename
-        self.recording = False
+        # Set to end the recording; stop() wakes the recording thread immediately
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.thread: Optional[threading.Thread] = None
         self.level_callback = level_callback
         self.smoothed_level: float = 0.0
         self.stream: Optional[sd.InputStream] = None
         self.file: Optional[sf.SoundFile] = None
         self._lock: threading.Lock = threading.Lock()
-        self.audio_data: list[np.ndarray] = []  # Store audio chunks for analysis
-        self.silence_start: Optional[float] = None
+        # Reusable mono buffer and downmix function, chosen once per recording in _record
+        self._mono_buf: Optional[np.ndarray] = None
+        self._mix_buf: Optional[np.ndarray] = None  # int32 accumulator for integer downmix
+        self._downmix: Callable[[np.ndarray], np.ndarray] = self._downmix_passthrough
+        self._use_kernel = False  # Fused numba downmix + RMS, see modules/_audio_kernels.py
+        # Accumulator dtype and full-scale value for level RMS, set from STREAM_DTYPE in _record
+        self._acc_dtype: Any = np.float64
+        self._full_scale = 1.0
+        self.silence_start: Optional[float] = None  # Stream time (seconds) when initial silence began
+        self._frames_seen = 0  # Frames delivered to the callback so far, used as the stream clock
         self.silent_start_timeout = silent_start_timeout
         self.auto_stopped = False
         self.recording_start_time: Optional[float] = None
         self.initial_sound_detected = False  # Track if we've detected any sound
+        self._events: deque = deque(maxlen=64)  # (code, args) pairs, see EVENT_MESSAGES
 
-    def _calculate_level(self, indata: np.ndarray) -> float:
-        """Calculate audio level from input data"""
-        # For multi-channel, average across all channels first for RMS calculation
-        if indata.ndim > 1:
-            mono_for_rms = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata.flatten()
-        else:
-            mono_for_rms = indata
+    def _block_rms(self, mono: np.ndarray) -> float:
+        """RMS of one downmixed (1D) block, normalized to full scale (0.0 - 1.0)"""
+        # Measured on the downmix, not on every channel sample: uncorrelated noise on N
+        # channels would read ~sqrt(N) louder and could keep silence above the threshold.
+        # Integer samples accumulate in int64 so squares can't overflow.
+        sum_squares = np.einsum('i,i->', mono, mono, dtype=self._acc_dtype)
+        return math.sqrt(float(sum_squares) / mono.size) / self._full_scale
 
-        rms = np.sqrt(np.mean(np.square(mono_for_rms)))
+    def _calculate_level(self, rms: float, stream_time: float) -> float:
+        """Calculate audio level from a block's RMS.
 
+        stream_time is the position in seconds of this block within the recording,
+        derived from the frame count so the callback never calls time.time().
+        """
         # Convert to dB for level display
-        db = 20 * np.log10(max(1e-10, rms))
+        db = 20 * math.log10(max(1e-10, rms))
         normalized = (db + 60) / 60
         current_level = max(0.0, min(1.0, normalized))
 
@@ -73,17 +106,17 @@ class AudioRecorder:
 
             if rms < SILENCE_THRESHOLD:
                 if self.silence_start is None:
-                    self.silence_start = time.time()
-                    print(f"Initial silence detected (RMS: {rms:.6f} < {SILENCE_THRESHOLD}, dB: {db:.1f})")
-                elif time.time() - self.silence_start >= self.silent_start_timeout:
-                    print(f"Stopping due to {self.silent_start_timeout}s of initial silence (RMS: {rms:.6f})")
+                    self.silence_start = stream_time
+                    self._events.append(('silence_start', (rms, SILENCE_THRESHOLD, db)))
+                elif stream_time - self.silence_start >= self.silent_start_timeout:
+                    self._events.append(('silence_timeout', (self.silent_start_timeout, rms)))
                     self.auto_stopped = True
-                    self.recording = False
+                    self._stop_event.set()
                     return 0.0
             else:
                 # We've detected sound, stop checking for silence
                 if self.silence_start is not None:
-                    print(f"Sound detected! (RMS: {rms:.6f} >= {SILENCE_THRESHOLD}, dB: {db:.1f})")
+                    self._events.append(('sound_detected', (rms, SILENCE_THRESHOLD, db)))
                 self.initial_sound_detected = True
                 self.silence_start = None
 
@@ -96,6 +129,53 @@ class AudioRecorder:
 
         return self.smoothed_level
 
+    def _get_buffers(self, frames: int, dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (mono, mix) scratch views of at least `frames` samples, growing them if needed"""
+        if self._mono_buf is None or self._mono_buf.shape[0] < frames:
+            self._mono_buf = np.empty(frames, dtype=dtype)
+            self._mix_buf = np.empty(frames, dtype=np.int32)
+        return self._mono_buf[:frames], self._mix_buf[:frames]
+
+    def _select_downmix(self, channels: int, dtype: str) -> Callable[[np.ndarray], np.ndarray]:
+        """Pick the downmix for this stream's layout so the callback never branches on it"""
+        if channels <= 1:
+            return self._downmix_passthrough
+        if np.dtype(dtype) == np.int16:
+            return self._downmix_int16_stereo if channels == 2 else self._downmix_int16_multi
+        return self._downmix_mean
+
+    def _downmix_passthrough(self, indata: np.ndarray) -> np.ndarray:
+        """Single-channel input: return a 1D view without copying"""
+        return indata.reshape(-1)
+
+    def _downmix_mean(self, indata: np.ndarray) -> np.ndarray:
+        """Average float channels into the preallocated mono buffer"""
+        mono, _ = self._get_buffers(indata.shape[0], indata.dtype)
+        np.mean(indata, axis=1, out=mono)
+        return mono
+
+    def _downmix_int16_stereo(self, indata: np.ndarray) -> np.ndarray:
+        """Average two int16 channels with an integer add and shift (no float round-trip)"""
+        mono, mix = self._get_buffers(indata.shape[0], indata.dtype)
+        np.add(indata[:, 0], indata[:, 1], out=mix, dtype=np.int32)
+        np.right_shift(mix, 1, out=mix)
+        np.copyto(mono, mix, casting='unsafe')
+        return mono
+
+    def _downmix_int16_multi(self, indata: np.ndarray) -> np.ndarray:
+        """Average N int16 channels using an int32 sum"""
+        mono, mix = self._get_buffers(indata.shape[0], indata.dtype)
+        np.add.reduce(indata, axis=1, dtype=np.int32, out=mix)
+        np.floor_divide(mix, indata.shape[1], out=mix)
+        np.copyto(mono, mix, casting='unsafe')
+        return mono
+
+    def _drain_events(self) -> None:
+        """Print events queued by the audio callback (runs on the recording thread)"""
+        while self._events:
+            code, args = self._events.popleft()
+            print(self.EVENT_MESSAGES[code].format(*args))
+
     def analyze_recording(self) -> Tuple[bool, str]:
         """Analyze the recorded audio file for silence and duration.
 
@@ -109,15 +189,18 @@ class AudioRecorder:
                 if duration < MIN_DURATION:
                     return False, f"Recording too short ({duration:.1f}s < {MIN_DURATION}s)"
 
-                # Read the entire file
-                audio_data = audio_file.read()
-
-                # Calculate RMS value
-                rms = np.sqrt(np.mean(np.square(audio_data)))
+                # Calculate RMS value by streaming 64 KiB blocks and accumulating the
+                # sum of squares, so memory use doesn't grow with recording length
+                sum_squares = 0.0
+                sample_count = 0
+                for block in audio_file.blocks(blocksize=16384, dtype='float32'):
+                    sum_squares += float(np.dot(block, block))
+                    sample_count += block.size
+                rms = math.sqrt(sum_squares / sample_count) if sample_count else 0.0
 
                 # Check if mostly silence
                 if rms < SILENCE_THRESHOLD:
-                    db_value = 20 * np.log10(max(1e-10, rms))
+                    db_value = 20 * math.log10(max(1e-10, rms))
                     return False, f"Recording contains mostly silence (RMS: {rms:.4f} / {db_value:.1f}dB < threshold: {SILENCE_THRESHOLD:.4f})"
 
                 return True, ""
@@ -142,60 +225,85 @@ class AudioRecorder:
         record_channels = device_channels
         print(f"Recording from device: {device_name} (ID: {device_id}, Channels: {record_channels})")
 
+        # Pick the downmix once instead of inspecting every block's shape
+        self._mono_buf = None
+        self._downmix = self._select_downmix(record_channels, STREAM_DTYPE)
+        self._use_kernel = NUMBA_AVAILABLE and record_channels > 1
+        if np.issubdtype(np.dtype(STREAM_DTYPE), np.integer):
+            self._acc_dtype = np.int64
+            self._full_scale = float(-np.iinfo(STREAM_DTYPE).min)  # 32768 for int16
+        else:
+            self._acc_dtype = np.float64
+            self._full_scale = 1.0
+        if self._use_kernel:
+            warm_up(record_channels, STREAM_DTYPE)
+
         def audio_callback(indata: np.ndarray,
                          frames: int,
                          time_info: Any,
                          status: int) -> None:
             if status:
-                print(f'Audio callback status: {status}')
-
-            with self._lock:
-                if not self.recording or self.file is None:
-                    return
-
-                if self.level_callback:
-                    level = self._calculate_level(indata)
-                    self.level_callback(level)
-
-                    # If auto-stopped, stop the stream
-                    if self.auto_stopped:
-                        self.recording = False
-                        raise sd.CallbackStop()
-
-                # Only write audio data if not auto-stopped
-                if not self.auto_stopped and self.file is not None:
-                    try:
-                        # Convert multi-channel to mono by averaging channels
-                        if indata.ndim > 1 and indata.shape[1] > 1:
-                            # Average across channels to create mono (results in 1D array)
-                            # Convert back to int16 after averaging to match PCM_16 format
-                            mono_data = np.mean(indata, axis=1).astype(indata.dtype)
-                        else:
-                            # Already mono or 1D
-                            mono_data = indata.flatten() if indata.ndim > 1 else indata
-                        self.file.write(mono_data)
-                    except Exception as e:
-                        print(f"Audio callback error: {e}")
-                        self.recording = False
-                        raise sd.CallbackStop()
+                self._events.append(('status', (status,)))
+
+            # No lock here: taking a Python lock inside the PortAudio callback risks
+            # priority inversion. The stop event is set by stop(), and `file` is only
+            # cleared after the stream context has drained callbacks.
+            audio_file = self.file
+            if self._stop_event.is_set() or audio_file is None:
+                return
+
+            mono_data = None
+            if self.level_callback:
+                self._frames_seen += frames
+                if self._use_kernel:
+                    # One pass produces both the mono block and its level
+                    mono_data, _ = self._get_buffers(frames, indata.dtype)
+                    rms = rms_and_downmix(indata, mono_data) / self._full_scale
+                else:
+                    # The downmix is reused for the write below
+                    mono_data = self._downmix(indata)
+                    rms = self._block_rms(mono_data)
+                level = self._calculate_level(rms, self._frames_seen / SAMPLE_RATE)
+                self.level_callback(level)
+
+                # If auto-stopped, stop the stream
+                if self.auto_stopped:
+                    self._stop_event.set()
+                    raise sd.CallbackStop()
+
+            # Only write audio data if not auto-stopped
+            if not self.auto_stopped:
+                try:
+                    # Convert multi-channel to mono by averaging channels
+                    if mono_data is None:
+                        mono_data = self._downmix(indata)
+                    audio_file.write(mono_data)
+                except Exception as e:
+                    self._events.append(('callback_error', (e,)))
+                    self._stop_event.set()
+                    raise sd.CallbackStop()
 
         try:
             # Always save as mono WAV
             with sf.SoundFile(self.filename, mode='w',
-                            samplerate=22050,
+                            samplerate=SAMPLE_RATE,
                             channels=1,
                             subtype='PCM_16',
                             format='WAV') as self.file:
                 # But record with device's actual channel count
-                with sd.InputStream(samplerate=22050,
+                with sd.InputStream(samplerate=SAMPLE_RATE,
                                   channels=record_channels,
+                                  dtype=STREAM_DTYPE,
                                   callback=audio_callback) as self.stream:
-                    while self.recording:
-                        sd.sleep(100)
+                    # Wakes as soon as stop() sets the event; the timeout only
+                    # paces printing of events queued by the callback
+                    while not self._stop_event.wait(timeout=0.5):
+                        self._drain_events()
         except Exception as e:
             print(f"Recording error: {e}")
             self.auto_stopped = True
         finally:
+            self._drain_events()
             with self._lock:
                 if self.stream is not None:
                     try:
@@ -214,16 +322,17 @@ class AudioRecorder:
         """Start recording and reset silence detection"""
         self.auto_stopped = False
         self.silence_start = None
+        self._frames_seen = 0
         self.initial_sound_detected = False
         self.recording_start_time = time.time()
-        self.recording = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._record)
         self.thread.start()
 
     def stop(self) -> None:
         """Stop recording with timeout to prevent hanging"""
-        with self._lock:
-            self.recording = False
+        # Closing the stream in _record drains pending callbacks, so no lock is needed
+        self._stop_event.set()
 
         if self.thread:
             # Add timeout to thread.join() to prevent hanging
@@ -1,10 +1,58 @@
+import atexit
+import hashlib
 import json
 import os
-from typing import Any, Dict
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# orjson is optional: it parses and serializes straight from/to bytes and is several
+# times faster than the stdlib. Both paths write the same 2-space indented UTF-8 JSON.
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
+
+# Delay before pending changes are written, so a burst of set() calls (e.g. several
+# tray toggles) results in a single save
+SAVE_DELAY = 0.5
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bump when adding a migration. Files stamped with this version skip _run_migrations()
+# entirely. Deliberately not in default_settings: defaults are merged under the loaded
+# file, which would make an unversioned (old) file look current.
+SCHEMA_VERSION = 2
+
+# Shared by every Settings instance: they all write the same file through the same
+# temp path, so writes must be single-writer across instances, not just within one
+_write_lock = threading.Lock()
+# Digest of the payload most recently written to the file by any instance, guarded by
+# _write_lock; see Settings.save_settings()
+_saved_digest: Optional[bytes] = None
 
 class Settings:
+    # Every instance created (app, recorder and transcribe each keep their own), so
+    # exit paths that bypass atexit can flush them all with flush_all()
+    _instances: List['Settings'] = []
+
     def __init__(self) -> None:
-        self.settings_file: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
+        # _lock guards current_settings and the dirty/timer state (it's re-entrant so
+        # helpers like favorites_as_set() can call get()); file writes go through the
+        # module-level _write_lock
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._subscribers: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self.settings_file: str = os.path.join(_MODULE_DIR, 'settings.json')
         self.default_settings: Dict[str, Any] = {
             'continuous_capture': True,
             'smart_capture': False,
@@ -34,16 +82,28 @@ class Settings:
             # Logging
             'log_retention_days': 60
         }
-        self.current_settings: Dict[str, Any] = self.load_settings()
-        self._run_migrations()
+        with self._lock:
+            self.current_settings: Dict[str, Any] = self.load_settings()
+            self._run_migrations()
+        # Pending debounced writes are flushed on normal interpreter exit; callers that
+        # exit via os._exit() must call Settings.flush_all() themselves
+        atexit.register(self.flush)
+        Settings._instances.append(self)
 
     def _run_migrations(self) -> None:
         """Runs all necessary setting migrations and saves if changes were made."""
+        if self.current_settings.get('schema_version', 0) >= SCHEMA_VERSION:
+            return
+
         migrations_run = [
             self._migrate_device_settings(),
             self._migrate_silence_timeout()
         ]
 
+        # The stamp alone never triggers a write: if the file failed to load we're
+        # holding defaults, and saving them would overwrite the user's file. It's
+        # persisted with the next real save instead.
+        self.current_settings['schema_version'] = SCHEMA_VERSION
         if any(migrations_run):
             self.save_settings()
 
@@ -63,68 +123,150 @@ class Settings:
         changes_made = False
         from modules.audio_manager import get_device_by_id, create_device_identifier
 
+        # Old settings stored raw device IDs; resolve each distinct ID only once
+        identifiers_by_id: Dict[int, Optional[Dict[str, Any]]] = {}
+
+        def identifier_for(device_id: int) -> Optional[Dict[str, Any]]:
+            if device_id not in identifiers_by_id:
+                device = get_device_by_id(device_id)
+                identifiers_by_id[device_id] = create_device_identifier(device)._asdict() if device else None
+            return identifiers_by_id[device_id]
+
         # Migrate selected microphone
         if isinstance(self.current_settings.get('selected_microphone'), int):
             changes_made = True
-            device = get_device_by_id(self.current_settings['selected_microphone'])
-            if device:
-                identifier = create_device_identifier(device)
-                self.current_settings['selected_microphone'] = identifier._asdict()
-            else:
-                self.current_settings['selected_microphone'] = None
-
-        # Migrate favorite microphones
-        if self.current_settings.get('favorite_microphones'):
-            new_favorites = []
-            migrated_any_fav = False
-            # We need to handle list of mixed types (already migrated dicts and old ints)
-            for device_info in self.current_settings['favorite_microphones']:
-                if isinstance(device_info, int):
-                    migrated_any_fav = True
-                    device = get_device_by_id(device_info)
-                    if device:
-                        identifier = create_device_identifier(device)
-                        new_favorites.append(identifier._asdict())
-                else:
-                    new_favorites.append(device_info) # Keep as is
-
-            if migrated_any_fav:
-                self.current_settings['favorite_microphones'] = new_favorites
-                changes_made = True
+            self.current_settings['selected_microphone'] = identifier_for(self.current_settings['selected_microphone'])
+
+        # Migrate favorite microphones. The list may mix already migrated dicts (kept as
+        # is) with old ints; IDs that no longer resolve to a device are dropped.
+        favorites = self.current_settings.get('favorite_microphones')
+        if favorites and any(isinstance(device_info, int) for device_info in favorites):
+            self.current_settings['favorite_microphones'] = [
+                identifier_for(device_info) if isinstance(device_info, int) else device_info
+                for device_info in favorites
+                if not isinstance(device_info, int) or identifier_for(device_info) is not None
+            ]
+            changes_made = True
 
         return changes_made
 
     def load_settings(self) -> Dict[str, Any]:
         try:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    return {**self.default_settings, **json.load(f)}
+                # Read the whole file once and parse the contiguous buffer
+                loaded = _loads(Path(self.settings_file).read_bytes())
+                return {**self.default_settings, **loaded}
             else:
                 # File doesn't exist, create it with default settings
                 self.save_defaults()
-                return self.default_settings.copy()
+                return {**self.default_settings, 'schema_version': SCHEMA_VERSION}
         except Exception as e:
             print(f"Error loading settings: {str(e)}")
             return self.default_settings.copy()
 
     def save_defaults(self) -> None:
         """Create settings file with default values if it doesn't exist"""
+        global _saved_digest
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.default_settings, f, indent=4)
+            with _write_lock:
+                self._write_atomic(_dumps({**self.default_settings, 'schema_version': SCHEMA_VERSION}))
+                _saved_digest = None  # The file no longer holds the last saved payload
         except Exception as e:
             print(f"Error creating default settings file: {str(e)}")
 
     def save_settings(self) -> None:
+        """Write current settings atomically so a crash can't leave partial JSON"""
+        global _saved_digest
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.current_settings, f, indent=4)
+            # Snapshot after taking the write lock, so saves land in snapshot order and
+            # the last write always holds the newest state; set()/get() only wait for the copy
+            with _write_lock:
+                with self._lock:
+                    data = dict(self.current_settings)
+                payload = _dumps(data)
+                # Skip the disk write when the file already holds this exact payload (e.g.
+                # an option toggled and toggled back within the debounce window). The digest
+                # is module-level so another instance's write invalidates it.
+                digest = hashlib.blake2b(payload, digest_size=16).digest()
+                if digest == _saved_digest:
+                    return
+                self._write_atomic(payload)
+                _saved_digest = digest
         except Exception as e:
             print(f"Error saving settings: {str(e)}")
 
+    def _write_atomic(self, payload: bytes) -> None:
+        """Write the serialized bytes to a temp file in one call, then rename over the real file"""
+        tmp_file = self.settings_file + '.tmp'
+        # O_BINARY keeps Windows from translating newlines at the fd level
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, self.settings_file)
+
+    def flush(self) -> None:
+        """Write any pending changes to disk immediately"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+        self.save_settings()
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Write pending changes of every Settings instance to disk immediately"""
+        for instance in list(cls._instances):
+            instance.flush()
+
+    @staticmethod
+    def identifier_key(identifier: Dict[str, Any]) -> tuple:
+        """Hashable form of a stored device identifier dict, for set membership checks"""
+        return tuple(sorted(identifier.items()))
+
+    def favorites_as_set(self) -> frozenset:
+        """Favorite microphones as a frozenset of identifier_key() tuples"""
+        return frozenset(
+            self.identifier_key(d) for d in self.get('favorite_microphones') if isinstance(d, dict)
+        )
+
     def get(self, key: str) -> Any:
-        return self.current_settings.get(key, self.default_settings.get(key))
+        with self._lock:
+            return self.current_settings.get(key, self.default_settings.get(key))
+
+    def snapshot(self, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Values for several keys, read together under one lock acquisition"""
+        current, defaults = self.current_settings, self.default_settings
+        with self._lock:
+            return tuple(current[k] if k in current else defaults.get(k) for k in keys)
+
+    def subscribe(self, key: str, callback: Callable[[str, Any], None]) -> None:
+        """Call callback(key, value) after every set() of `key` on this instance"""
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(callback)
 
     def set(self, key: str, value: Any) -> None:
-        self.current_settings[key] = value
-        self.save_settings()
\ No newline at end of file
+        """Update a setting; the write to disk is debounced by SAVE_DELAY"""
+        with self._lock:
+            self.current_settings[key] = value
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            callbacks = tuple(self._subscribers.get(key, ()))
+
+        # Notify outside the lock so callbacks may read or write settings themselves
+        for callback in callbacks:
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"Error in settings subscriber for '{key}': {str(e)}")
\ No newline at end of file
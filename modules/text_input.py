@@ -0,0 +1,123 @@
+"""
+Types text into the focused window with Win32 SendInput Unicode events.
+
+This avoids the clipboard entirely: no save/paste/restore round trip and no race
+with other clipboard users. inject_unicode() returns False where it isn't
+supported (non-Windows), for multi-line text, or when Windows rejected the input,
+so callers can fall back to pasting; send_paste_shortcut() provides a native
+Ctrl+V for that path.
+"""
+
+import sys
+import ctypes
+from typing import List
+
+if sys.platform == 'win32':
+    from ctypes import wintypes
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    VK_CONTROL = 0x11
+    VK_V = 0x56
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD),
+                    ("wScan", wintypes.WORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.c_size_t)]  # ULONG_PTR
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG),
+                    ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.c_size_t)]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [("uMsg", wintypes.DWORD),
+                    ("wParamL", wintypes.WORD),
+                    ("wParamH", wintypes.WORD)]
+
+    # The union must include every member so sizeof(INPUT) matches what SendInput expects
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("ki", KEYBDINPUT),
+                    ("mi", MOUSEINPUT),
+                    ("hi", HARDWAREINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD),
+                    ("union", _INPUTUNION)]
+
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+    _user32.SendInput.restype = wintypes.UINT
+
+
+def _key_events(text: str) -> List[tuple]:
+    """(vk, scan, flags) for a key down + up per UTF-16 code unit"""
+    events = []
+    data = text.encode('utf-16-le')
+    # Characters outside the BMP arrive as two code units (a surrogate pair)
+    for i in range(0, len(data), 2):
+        unit = data[i] | (data[i + 1] << 8)
+        events.append((0, unit, KEYEVENTF_UNICODE))
+        events.append((0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return events
+
+
+def _send(events: List[tuple]) -> int:
+    """Deliver (vk, scan, flags) keyboard events with one SendInput call; returns the count sent"""
+    inputs = (INPUT * len(events))()
+    for slot, (vk, scan, flags) in zip(inputs, events):
+        slot.type = INPUT_KEYBOARD
+        ki = slot.union.ki
+        ki.wVk = vk
+        ki.wScan = scan
+        ki.dwFlags = flags
+    return _user32.SendInput(len(events), inputs, ctypes.sizeof(INPUT))
+
+
+def send_paste_shortcut() -> bool:
+    """
+    Press Ctrl+V in the focused window. Returns False where unsupported or unless all
+    four events were delivered, so the caller can fall back to pyautogui (which also
+    releases a Ctrl left held by a partial send).
+
+    On Windows the paste path mostly runs for multi-line text, which inject_unicode()
+    declines; otherwise it's only reached after a SendInput call already failed, in
+    which case this usually fails too and pyautogui takes over.
+    """
+    if sys.platform != 'win32':
+        return False
+    events = [
+        (VK_CONTROL, 0, 0),
+        (VK_V, 0, 0),
+        (VK_V, 0, KEYEVENTF_KEYUP),
+        (VK_CONTROL, 0, KEYEVENTF_KEYUP),
+    ]
+    return _send(events) == len(events)
+
+
+def inject_unicode(text: str) -> bool:
+    """
+    Type `text` into the focused window with a single SendInput call.
+
+    Returns False if unsupported or if nothing was delivered (e.g. the target runs
+    elevated and UIPI blocks the input). A partial send still returns True so the
+    caller doesn't paste the text a second time.
+
+    Text containing line breaks is declined (False): the only way to type one is an
+    Enter key press, which sends the message in chat apps, submits forms and accepts
+    IDE completions. Pasting keeps them as literal line breaks.
+    """
+    if sys.platform != 'win32':
+        return False
+    if '\n' in text or '\r' in text:
+        return False
+    if not text:
+        return True
+
+    return _send(_key_events(text)) > 0
@@ -1,13 +1,13 @@
 """Multi-provider Speech-to-Text module with Strategy pattern"""
 import os
 import logging
-from typing import Union, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Import all provider classes
-from services.openai_stt import OpenAITranscriber
-from services.google_stt import GoogleTranscriber
+# Provider classes are imported inside _create_transcriber so only the selected
+# provider's SDK (openai, google-cloud-speech/gRPC, ...) gets loaded
 from modules.settings import Settings
 
 # OpenAI Speech to text docs: https://platform.openai.com/docs/guides/speech-to-text
@@ -20,31 +20,56 @@ logger = logging.getLogger('voice_typing')
 # Initialize settings
 settings = Settings()
 
+# Transcriber instances keyed on (provider, model, language). Reusing them keeps the
+# provider's HTTP/gRPC client (and its TLS session) alive between transcriptions.
+_TRANSCRIBER_CACHE: Dict[Tuple[str, Optional[str], str], Any] = {}
 
-def _get_transcriber(provider_name: str):
+
+def _create_transcriber(provider_name: str, model: Optional[str], language: str):
+    """Construct a new transcriber for the given provider"""
+    if provider_name == "openai":
+        from services.openai_stt import OpenAITranscriber
+        return OpenAITranscriber(model=model, language=language)
+    elif provider_name == "google":
+        from services.google_stt import GoogleTranscriber
+        return GoogleTranscriber(language=language)
+    # Add other providers here as needed
+    else:
+        raise ValueError(f"Unknown STT provider: {provider_name}")
+
+
+def _get_transcriber(provider_name: str, language: Optional[str] = None):
     """
     Factory function to get a transcriber instance based on provider name
 
     Args:
         provider_name: Name of the provider ('openai', 'google', etc.)
+        language: Optional language override (uses the provider's setting if not provided)
 
     Returns:
-        Transcriber instance for the specified provider
+        Transcriber instance for the specified provider, reused from _TRANSCRIBER_CACHE
+        when one with the same provider, model and language already exists
 
     Raises:
         ValueError: If provider is unknown
     """
     if provider_name == "openai":
         model = settings.get('openai_stt_model') or 'gpt-4o-mini-transcribe'
-        language = settings.get('stt_language') or 'en'
-        return OpenAITranscriber(model=model, language=language)
+        default_language = settings.get('stt_language') or 'en'
     elif provider_name == "google":
-        language = settings.get('google_stt_language') or 'en-US'
-        return GoogleTranscriber(language=language)
+        model = None
+        default_language = settings.get('google_stt_language') or 'en-US'
     # Add other providers here as needed
     else:
         raise ValueError(f"Unknown STT provider: {provider_name}")
 
+    key = (provider_name, model, language or default_language)
+    transcriber = _TRANSCRIBER_CACHE.get(key)
+    if transcriber is None:
+        transcriber = _create_transcriber(*key)
+        _TRANSCRIBER_CACHE[key] = transcriber
+    return transcriber
+
 
 def transcribe_audio(filename: str, language: Optional[str] = None) -> str:
     """
@@ -63,14 +88,18 @@ def transcribe_audio(filename: str, language: Optional[str] = None) -> str:
     Raises:
         Exception: If transcription fails
     """
-    provider = settings.get('stt_provider') or 'openai'
+    provider, stt_language, lowercase_short, lowercase_threshold = settings.snapshot(
+        ('stt_provider', 'stt_language', 'lowercase_short_transcriptions', 'lowercase_threshold')
+    )
+    provider = provider or 'openai'
 
     # Get language from parameter or settings
     if language is None:
-        language = settings.get('stt_language') or 'en'
+        language = stt_language or 'en'
 
     try:
-        transcriber = _get_transcriber(provider)
+        # The cache key includes the language, so the instance is already configured for it
+        transcriber = _get_transcriber(provider, language)
 
         # Get model info if available
         model_info = ""
@@ -79,23 +108,22 @@ def transcribe_audio(filename: str, language: Optional[str] = None) -> str:
 
         logger.info(f"Using provider: {provider}{model_info}, language: {language}")
 
-        # Update language if provided as parameter
-        if language and hasattr(transcriber, 'update_language'):
-            transcriber.update_language(language)
-
         # Transcribe the audio
         result = transcriber.transcribe(filename)
 
         # Apply lowercase for short transcriptions if enabled
-        if settings.get('lowercase_short_transcriptions'):
-            threshold = settings.get('lowercase_threshold') or 0
-            if threshold > 0:
-                word_count = len(result.split())
+        if lowercase_short:
+            # int() accepts hand-edited float values such as 4.0, which split() rejects
+            threshold = int(lowercase_threshold or 0)
+            if threshold > 0 and result:
+                # Split at most `threshold` times: anything longer yields threshold + 1
+                # pieces, so long transcriptions never build a full word list
+                word_count = len(result.split(None, threshold))
                 if word_count <= threshold:
                     # Convert first character to lowercase, preserving rest of text
-                    result = result[0].lower() + result[1:] if len(result) > 0 else result
+                    result = result[0].lower() + result[1:]
                     # Remove trailing period if present
-                    if result.endswith('.'):
+                    if result[-1] == '.':
                         result = result[:-1]
                     logger.debug(f"Applied lowercase and removed period for {word_count}-word transcription")
 
@@ -113,6 +141,9 @@ def set_stt_provider(provider: str) -> None:
     Args:
         provider: Provider name ('openai', 'google', etc.)
     """
+    # Drop transcribers built for the previous provider
+    _TRANSCRIBER_CACHE.clear()
+
     # Validate provider
     try:
         _get_transcriber(provider)  # This will raise if provider is invalid
@@ -128,12 +159,21 @@ def get_current_provider() -> str:
     return settings.get('stt_provider') or 'openai'
 
 
-def get_available_providers() -> list:
-    """Get list of available STT providers"""
+def get_available_providers() -> tuple:
+    """Get the available STT providers (cached; recomputed when the API key env vars change)"""
+    return _providers_snapshot(
+        bool(os.environ.get("OPENAI_API_KEY")),
+        bool(os.environ.get("GOOGLE_CLOUD_API_KEY"))
+    )
+
+
+@lru_cache(maxsize=1)
+def _providers_snapshot(has_openai_key: bool, has_google_key: bool) -> tuple:
+    """Build the provider list for the given key availability. Callers must not mutate it."""
     providers = []
 
     # Check OpenAI
-    if os.environ.get("OPENAI_API_KEY"):
+    if has_openai_key:
         providers.append({
             'name': 'openai',
             'display_name': 'OpenAI',
@@ -141,14 +181,14 @@ def get_available_providers() -> list:
         })
 
     # Check Google
-    if os.environ.get("GOOGLE_CLOUD_API_KEY"):
+    if has_google_key:
         providers.append({
             'name': 'google',
             'display_name': 'Google Cloud',
             'models': []  # Google doesn't have selectable models in same way
         })
 
-    return providers
+    return tuple(providers)
 
 
 # Maintain backward compatibility with old function signature
@@ -1,6 +1,6 @@
 import os
 import threading
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import pyperclip
 import pystray
@@ -8,12 +8,31 @@ from PIL import Image, ImageDraw
 
 from modules.audio_manager import get_input_devices, get_default_device_id, set_input_device, create_device_identifier
 from modules import transcribe
+from modules.settings import Settings
+
+# Menu labels for OpenAI STT models; unknown models show their raw name
+_OPENAI_MODEL_DISPLAY = {
+    'gpt-4o-transcribe': 'GPT-4o (Best)',
+    'gpt-4o-mini-transcribe': 'GPT-4o Mini',
+    'whisper-1': 'Whisper (Legacy)',
+}
+
+# Repository root; icon paths such as 'assets/microphone-blue.png' are relative to it
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Decoded tray icons keyed on their asset path, so status changes don't re-read the PNG
+_ICON_CACHE: Dict[str, Image.Image] = {}
 
 def create_tray_icon(icon_path: str) -> Image.Image:
     """Create tray icon from file path"""
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    icon_path = os.path.join(current_dir, icon_path)
-    return Image.open(icon_path)
+    cached = _ICON_CACHE.get(icon_path)
+    if cached is not None:
+        return cached
+    with Image.open(os.path.join(_PROJECT_DIR, icon_path)) as image:
+        image.load()  # Decode now so the file handle can be closed
+        icon_image = image.copy()
+    _ICON_CACHE[icon_path] = icon_image
+    return icon_image
 
 def create_copy_menu(app):
     """Creates dynamic menu of recent transcriptions"""
@@ -28,46 +47,77 @@ def create_copy_menu(app):
         for text in app.history.get_recent()
     ]
 
+class _MicHandler:
+    """Menu action selecting one input device"""
+    __slots__ = ('app', 'device', 'identifier')
+
+    def __init__(self, app, device: Dict[str, Any], identifier: Dict[str, Any]) -> None:
+        self.app = app
+        self.device = device
+        self.identifier = identifier
+
+    def __call__(self, icon, item) -> None:
+        app, device = self.app, self.device
+        app.settings.set('selected_microphone', self.identifier)
+        set_input_device(device['id'])
+        # Log the device change
+        app.logger.info(f"Microphone changed to: {device['name']} (ID: {device['id']}, Channels: {device['max_input_channels']}, Sample Rate: {device['default_samplerate']} Hz)")
+        # Refresh menu to update checkmark (the selected_microphone subscription has
+        # already invalidated the microphone section)
+        app.update_icon_menu()
+
+class _FavoriteHandler:
+    """Menu action toggling one device in the favorites list"""
+    __slots__ = ('app', 'favorites', 'identifier')
+
+    def __init__(self, app, favorites: List[Dict[str, Any]], identifier: Dict[str, Any]) -> None:
+        self.app = app
+        self.favorites = favorites  # The settings' own list, shared by every handler of one menu build
+        self.identifier = identifier
+
+    def __call__(self, icon, item) -> None:
+        app, favorites, identifier = self.app, self.favorites, self.identifier
+
+        if identifier in favorites:
+            favorites.remove(identifier)
+        else:
+            favorites.append(identifier)
+
+        app.settings.set('favorite_microphones', favorites)
+        app.update_icon_menu()
+
+# Shared `checked` predicates. The microphone menu is rebuilt whenever selection or
+# favorites change, so each item's state is a constant and needs no per-item lambda.
+def _checked(item) -> bool:
+    return True
+
+def _unchecked(item) -> bool:
+    return False
+
 def create_microphone_menu(app):
     """Creates dynamic menu of available microphones"""
-    devices = sorted(get_input_devices(), key=lambda d: d['name'].lower())
+    # get_input_devices() returns a fresh list, so sort it in place; the key is
+    # lowercased once per device, not per comparison
+    devices = get_input_devices()
+    devices.sort(key=lambda d: d['name'].lower())
     current_identifier = app.settings.get('selected_microphone')
-    favorite_identifiers = app.settings.get('favorite_microphones')
+    current_key = app.settings.identifier_key(current_identifier) if current_identifier else None
+    favorite_keys = app.settings.favorites_as_set()
+    # Handlers mutate this list in place; their set() invalidates the section, so the
+    # next build reads a fresh reference
+    favorites = app.settings.get('favorite_microphones')
     default_device_id = get_default_device_id()
 
-    def make_mic_handler(device: Dict[str, any]):
-        def handler(icon, item):
-            identifier = create_device_identifier(device)._asdict()
-            app.settings.set('selected_microphone', identifier)
-            set_input_device(device['id'])
-            # Log the device change
-            app.logger.info(f"Microphone changed to: {device['name']} (ID: {device['id']}, Channels: {device['max_input_channels']}, Sample Rate: {device['default_samplerate']} Hz)")
-            # Refresh menu to update checkmark
-            app.update_icon_menu()
-        return handler
-
-    def make_favorite_handler(device: Dict[str, any]):
-        def handler(icon, item):
-            identifier = create_device_identifier(device)._asdict()
-            favorites = app.settings.get('favorite_microphones')
-
-            if identifier in favorites:
-                favorites.remove(identifier)
-            else:
-                favorites.append(identifier)
-
-            app.settings.set('favorite_microphones', favorites)
-            app.update_icon_menu()
-        return handler
-
     # Create menu items
     select_items = []
     favorite_items = []
 
     for device in devices:
+        # Computed once per device
         identifier = create_device_identifier(device)._asdict()
-        is_favorite = identifier in favorite_identifiers
-        is_selected = identifier == current_identifier
+        identifier_key = app.settings.identifier_key(identifier)
+        is_favorite = identifier_key in favorite_keys
+        is_selected = identifier_key == current_key
         is_default = device['id'] == default_device_id
 
         star_prefix = "💫 " if is_favorite else "    "
@@ -77,16 +127,16 @@ def create_microphone_menu(app):
         select_items.append(
             pystray.MenuItem(
                 f"{combined_prefix}{device['name']}",
-                make_mic_handler(device),
-                checked=lambda item, dev=device: create_device_identifier(dev)._asdict() == current_identifier
+                _MicHandler(app, device, identifier),
+                checked=_checked if is_selected else _unchecked
             )
         )
 
         favorite_items.append(
             pystray.MenuItem(
                 f"{default_prefix}{device['name']}",
-                make_favorite_handler(device),
-                checked=lambda item, dev=device: create_device_identifier(dev)._asdict() in favorite_identifiers
+                _FavoriteHandler(app, favorites, identifier),
+                checked=_checked if is_favorite else _unchecked
             )
         )
 
@@ -142,11 +192,7 @@ def create_stt_provider_menu(app):
         openai_provider = next((p for p in available_providers if p['name'] == 'openai'), None)
         if openai_provider:
             for model in openai_provider['models']:
-                display_name = {
-                    'gpt-4o-transcribe': 'GPT-4o (Best)',
-                    'gpt-4o-mini-transcribe': 'GPT-4o Mini',
-                    'whisper-1': 'Whisper (Legacy)',
-                }.get(model, model)
+                display_name = _OPENAI_MODEL_DISPLAY.get(model, model)
 
                 model_items.append(
                     pystray.MenuItem(
@@ -180,6 +226,10 @@ def create_stt_provider_menu(app):
     return menu_items
 
 def setup_tray_icon(app):
+    # Decode every status icon up front so the first status change doesn't hit the disk
+    for config in app.status_manager.STATUS_CONFIGS.values():
+        create_tray_icon(config.tray_icon_file)
+
     # Create a single icon instance
     icon = pystray.Icon(
         'Voice Typing',
@@ -226,172 +276,193 @@ def setup_tray_icon(app):
     def on_exit(icon, item):
         """Log exit and close the application."""
         app.logger.info("Application exiting.")
+        Settings.flush_all()  # os._exit() skips atexit, so persist pending settings first
         icon.stop()
         # Ensure clean exit of the application
         os._exit(0)
 
-    def get_menu():
-        # Dynamic menu that updates when called
-        copy_menu = create_copy_menu(app)
-        microphone_menu = create_microphone_menu(app)
-        stt_menu = create_stt_provider_menu(app)  # Add STT provider menu
-
+    def build_settings_menu():
         return pystray.Menu(
-            # ↓ This is now the default item, triggered on left-click.
             pystray.MenuItem(
-                'Copy Last Transcription',
-                copy_latest_transcription,
-                default=True
+                'Continuous Capture',
+                lambda icon, item: None,
+                checked=lambda item: app.settings.get('continuous_capture')
             ),
             pystray.MenuItem(
-                '🔄 Retry Last Transcription',
-                lambda icon, item: app.retry_transcription(),
-                enabled=lambda item: app.last_recording is not None
+                'Clean Transcription',
+                lambda icon, item: app.toggle_clean_transcription(),
+                checked=lambda item: app.settings.get('clean_transcription')
             ),
             pystray.MenuItem(
-                'Recent Transcriptions',
-                pystray.Menu(*copy_menu) if copy_menu else pystray.Menu(
-                    pystray.MenuItem('No transcriptions yet', None, enabled=False)
-                ),
-                enabled=bool(copy_menu)
+                'Lowercase Short Transcriptions',
+                lambda icon, item: app.toggle_lowercase_short(),
+                checked=lambda item: app.settings.get('lowercase_short_transcriptions')
             ),
             pystray.MenuItem(
-                'Microphone',
-                pystray.Menu(*microphone_menu)
-            ),
-            pystray.MenuItem(
-                'Settings',
+                'Silence Detection',
                 pystray.Menu(
                     pystray.MenuItem(
-                        'Continuous Capture',
-                        lambda icon, item: None,
-                        checked=lambda item: app.settings.get('continuous_capture')
-                    ),
-                    pystray.MenuItem(
-                        'Clean Transcription',
-                        lambda icon, item: app.toggle_clean_transcription(),
-                        checked=lambda item: app.settings.get('clean_transcription')
-                    ),
-                    pystray.MenuItem(
-                        'Lowercase Short Transcriptions',
-                        lambda icon, item: app.toggle_lowercase_short(),
-                        checked=lambda item: app.settings.get('lowercase_short_transcriptions')
+                        'Enable Silent-Start Timeout',
+                        lambda icon, item: app.toggle_silence_detection(),
+                        checked=lambda item: app.settings.get('silent_start_timeout') is not None
                     ),
+                    pystray.Menu.SEPARATOR,
                     pystray.MenuItem(
-                        'Silence Detection',
+                        'Silence Threshold',
                         pystray.Menu(
                             pystray.MenuItem(
-                                'Enable Silent-Start Timeout',
-                                lambda icon, item: app.toggle_silence_detection(),
-                                checked=lambda item: app.settings.get('silent_start_timeout') is not None
+                                'Ultra Permissive (0.001)',
+                                lambda icon, item: app.set_silence_threshold(0.001),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.001) < 0.0001
                             ),
-                            pystray.Menu.SEPARATOR,
                             pystray.MenuItem(
-                                'Silence Threshold',
-                                pystray.Menu(
-                                    pystray.MenuItem(
-                                        'Ultra Permissive (0.001)',
-                                        lambda icon, item: app.set_silence_threshold(0.001),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.001) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Very Permissive (0.002)',
-                                        lambda icon, item: app.set_silence_threshold(0.002),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.002) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Permissive (0.003)',
-                                        lambda icon, item: app.set_silence_threshold(0.003),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.003) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Moderate (0.005)',
-                                        lambda icon, item: app.set_silence_threshold(0.005),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.005) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Normal (0.01)',
-                                        lambda icon, item: app.set_silence_threshold(0.01),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.01) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Strict (0.015)',
-                                        lambda icon, item: app.set_silence_threshold(0.015),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.015) < 0.0001
-                                    ),
-                                    pystray.MenuItem(
-                                        'Very Strict (0.02)',
-                                        lambda icon, item: app.set_silence_threshold(0.02),
-                                        checked=lambda item: abs(app.settings.get('silence_threshold') - 0.02) < 0.0001
-                                    ),
-                                )
+                                'Very Permissive (0.002)',
+                                lambda icon, item: app.set_silence_threshold(0.002),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.002) < 0.0001
                             ),
-                        )
-                    ),
-                    pystray.MenuItem(
-                        'Change Cursor on Recording',
-                        lambda icon, item: app.toggle_cursor_change(),
-                        checked=lambda item: app.settings.get('change_cursor_on_recording')
-                    ),
-                    pystray.MenuItem(
-                        'Smart Capture',
-                        lambda icon, item: None,
-                        enabled=False
-                    ),
-                    pystray.MenuItem(
-                        'Recording Indicator',
-                        pystray.Menu(
-                            # Size options
                             pystray.MenuItem(
-                                'Normal Size',
-                                lambda icon, item: change_ui_size('normal'),
-                                checked=lambda item: app.settings.get('ui_indicator_size') == 'normal'
+                                'Permissive (0.003)',
+                                lambda icon, item: app.set_silence_threshold(0.003),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.003) < 0.0001
                             ),
                             pystray.MenuItem(
-                                'Mini Size',
-                                lambda icon, item: change_ui_size('mini'),
-                                checked=lambda item: app.settings.get('ui_indicator_size') == 'mini'
+                                'Moderate (0.005)',
+                                lambda icon, item: app.set_silence_threshold(0.005),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.005) < 0.0001
                             ),
-                            pystray.Menu.SEPARATOR,
-                            # Position options
                             pystray.MenuItem(
-                                'Top Left',
-                                lambda icon, item: change_ui_position('top-left'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'top-left'
+                                'Normal (0.01)',
+                                lambda icon, item: app.set_silence_threshold(0.01),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.01) < 0.0001
                             ),
                             pystray.MenuItem(
-                                'Top Center',
-                                lambda icon, item: change_ui_position('top-center'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'top-center'
+                                'Strict (0.015)',
+                                lambda icon, item: app.set_silence_threshold(0.015),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.015) < 0.0001
                             ),
                             pystray.MenuItem(
-                                'Top Right',
-                                lambda icon, item: change_ui_position('top-right'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'top-right'
-                            ),
-                            pystray.MenuItem(
-                                'Bottom Left',
-                                lambda icon, item: change_ui_position('bottom-left'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-left'
-                            ),
-                            pystray.MenuItem(
-                                'Bottom Center',
-                                lambda icon, item: change_ui_position('bottom-center'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-center'
-                            ),
-                            pystray.MenuItem(
-                                'Bottom Right',
-                                lambda icon, item: change_ui_position('bottom-right'),
-                                checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-right'
+                                'Very Strict (0.02)',
+                                lambda icon, item: app.set_silence_threshold(0.02),
+                                checked=lambda item: abs(app.settings.get('silence_threshold') - 0.02) < 0.0001
                             ),
                         )
                     ),
-                    pystray.MenuItem(  # Add STT submenu
-                        'Speech-to-Text',
-                        pystray.Menu(*stt_menu)
-                    )
                 )
             ),
+            pystray.MenuItem(
+                'Change Cursor on Recording',
+                lambda icon, item: app.toggle_cursor_change(),
+                checked=lambda item: app.settings.get('change_cursor_on_recording')
+            ),
+            pystray.MenuItem(
+                'Smart Capture',
+                lambda icon, item: None,
+                enabled=False
+            ),
+            pystray.MenuItem(
+                'Recording Indicator',
+                pystray.Menu(
+                    # Size options
+                    pystray.MenuItem(
+                        'Normal Size',
+                        lambda icon, item: change_ui_size('normal'),
+                        checked=lambda item: app.settings.get('ui_indicator_size') == 'normal'
+                    ),
+                    pystray.MenuItem(
+                        'Mini Size',
+                        lambda icon, item: change_ui_size('mini'),
+                        checked=lambda item: app.settings.get('ui_indicator_size') == 'mini'
+                    ),
+                    pystray.Menu.SEPARATOR,
+                    # Position options
+                    pystray.MenuItem(
+                        'Top Left',
+                        lambda icon, item: change_ui_position('top-left'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'top-left'
+                    ),
+                    pystray.MenuItem(
+                        'Top Center',
+                        lambda icon, item: change_ui_position('top-center'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'top-center'
+                    ),
+                    pystray.MenuItem(
+                        'Top Right',
+                        lambda icon, item: change_ui_position('top-right'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'top-right'
+                    ),
+                    pystray.MenuItem(
+                        'Bottom Left',
+                        lambda icon, item: change_ui_position('bottom-left'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-left'
+                    ),
+                    pystray.MenuItem(
+                        'Bottom Center',
+                        lambda icon, item: change_ui_position('bottom-center'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-center'
+                    ),
+                    pystray.MenuItem(
+                        'Bottom Right',
+                        lambda icon, item: change_ui_position('bottom-right'),
+                        checked=lambda item: app.settings.get('ui_indicator_position') == 'bottom-right'
+                    ),
+                )
+            ),
+            pystray.MenuItem(  # Add STT submenu
+                'Speech-to-Text',
+                pystray.Menu(*section('stt'))
+            )
+        )
+
+    # Submenus are built once and cached. A section is only rebuilt after it has been
+    # invalidated, either by a settings subscription below or by update_icon_menu(section)
+    # for changes that aren't settings (history, device list), so e.g. toggling an
+    # unrelated option doesn't re-enumerate devices
+    section_builders = {
+        'history': lambda: create_copy_menu(app),
+        'mic': lambda: create_microphone_menu(app),
+        'stt': lambda: create_stt_provider_menu(app),
+        'settings': build_settings_menu,
+    }
+    section_dependents = {'stt': ('settings',)}  # Settings embeds the STT submenu
+    menu_cache = {}
+
+    def section(name):
+        if name not in menu_cache:
+            menu_cache[name] = section_builders[name]()
+        return menu_cache[name]
+
+    def get_menu():
+        # Assemble the top-level menu from the cached sections
+        copy_menu = section('history')
+        microphone_menu = section('mic')
+
+        return pystray.Menu(
+            # ↓ This is now the default item, triggered on left-click.
+            pystray.MenuItem(
+                'Copy Last Transcription',
+                copy_latest_transcription,
+                default=True
+            ),
+            pystray.MenuItem(
+                '🔄 Retry Last Transcription',
+                lambda icon, item: app.retry_transcription(),
+                enabled=lambda item: app.last_recording is not None
+            ),
+            pystray.MenuItem(
+                'Recent Transcriptions',
+                pystray.Menu(*copy_menu) if copy_menu else pystray.Menu(
+                    pystray.MenuItem('No transcriptions yet', None, enabled=False)
+                ),
+                enabled=bool(copy_menu)
+            ),
+            pystray.MenuItem(
+                'Microphone',
+                pystray.Menu(*microphone_menu)
+            ),
+            pystray.MenuItem(
+                'Settings',
+                section('settings')
+            ),
             pystray.MenuItem('Restart', lambda icon, item: app.restart_app()),
             pystray.MenuItem('Exit', on_exit)
         )
@@ -399,7 +470,30 @@ def setup_tray_icon(app):
     # Initial menu setup
     icon.menu = get_menu()
     # Store the update function in the app to call it from elsewhere
-    app.update_icon_menu = lambda: setattr(icon, 'menu', get_menu()) # Updates the tray icon's menu
+    def invalidate_section(name):
+        for stale in (name,) + section_dependents.get(name, ()):
+            menu_cache.pop(stale, None)
+
+    # Sections whose contents are built from settings values. The STT keys are also
+    # watched on transcribe's own Settings instance, which set_stt_provider() writes to.
+    section_keys = {
+        'mic': ('selected_microphone', 'favorite_microphones'),
+        'stt': ('stt_provider', 'openai_stt_model'),
+    }
+    for name, keys in section_keys.items():
+        for key in keys:
+            invalidator = lambda key, value, name=name: invalidate_section(name)
+            app.settings.subscribe(key, invalidator)
+            if name == 'stt':
+                transcribe.settings.subscribe(key, invalidator)
+
+    def update_icon_menu(section_name=None):
+        """Refresh the tray menu, first invalidating `section_name` when given"""
+        if section_name is not None:
+            invalidate_section(section_name)
+        icon.menu = get_menu()
+
+    app.update_icon_menu = update_icon_menu
 
     # Start the icon's event loop in its own thread
     threading.Thread(target=icon.run).start()
\ No newline at end of file
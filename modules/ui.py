@@ -1,13 +1,21 @@
+import queue
 import threading
+import time
 import tkinter as tk
+from functools import lru_cache
 from typing import Optional, Callable, Any, Tuple
 
-from pynput import keyboard
-import pyautogui
-import pyperclip
+# pyautogui and pyperclip are imported in _paste_via_clipboard, the only place that
+# needs them (on Windows text is normally typed with SendInput), and pynput only by
+# the __main__ test harness
 
 from modules.status_manager import StatusConfig
 from modules.screen_utils import get_primary_monitor_geometry
+from modules.text_input import inject_unicode, send_paste_shortcut
+
+# Minimum interval between level bar redraws (~30 Hz); the audio callback reports
+# levels far more often than that
+LEVEL_REFRESH_MS = 33
 
 class UIFeedback:
     pyautogui_lock = threading.Lock()
@@ -24,21 +32,21 @@ class UIFeedback:
         # Configure dimensions based on size
         self._configure_size_attributes()
 
-        # Create the floating window
+        # Create the floating window. The indicator is the Tk root window itself rather
+        # than a Toplevel under a permanently hidden root, so there is a single window
+        # and a single after()/after_cancel() path for all timers.
         self.root = tk.Tk()
-        self.root.withdraw()  # Hide initially?
-        self.indicator = tk.Toplevel(self.root)
-        self.indicator.withdraw()
+        self.root.withdraw()  # Hidden until there is something to show
 
         # Configure the indicator window
-        self.indicator.overrideredirect(True)  # Remove window decorations
-        self.indicator.attributes('-topmost', True)  # Keep on top
-        self.indicator.attributes('-alpha', 0.85)  # Make window semi-transparent
-        self.indicator.configure(bg='red')
+        self.root.overrideredirect(True)  # Remove window decorations
+        self.root.attributes('-topmost', True)  # Keep on top
+        self.root.attributes('-alpha', 0.85)  # Make window semi-transparent
+        self.root.configure(bg='red')
 
         # Create main frame
         # Set borderwidth and highlightthickness to 0 to remove any hidden padding.
-        self.frame = tk.Frame(self.indicator, bg='red', borderwidth=0, highlightthickness=0)
+        self.frame = tk.Frame(self.root, bg='red', borderwidth=0, highlightthickness=0)
         self.frame.pack(fill='both', padx=self.frame_padding, pady=self.frame_padding)
 
         # Create label with click binding
@@ -48,6 +56,18 @@ class UIFeedback:
                             cursor="hand2", font=font_config)  # Change cursor to hand on hover
         self.label.pack()
 
+        # Tcl procedure that recolors the window, frame and label (plus any extra label
+        # options) in a single interpreter call; see _set_colors
+        self._recolor_cmd = f'::uifeedback_recolor_{id(self)}'
+        self._applied_bg = 'red'  # Background last set through _set_colors
+        self.root.tk.eval(
+            f'proc {self._recolor_cmd} {{bg args}} {{\n'
+            f'    {self.root} configure -bg $bg\n'
+            f'    {self.frame} configure -bg $bg\n'
+            f'    {self.label} configure -bg $bg {{*}}$args\n'
+            '}'
+        )
+
         # Create audio level indicator (initially hidden)
         # Set an initial width of 1px to prevent the canvas from dictating the window's width.
         # It will expand horizontally to fill the frame due to `fill='x'`.
@@ -56,12 +76,24 @@ class UIFeedback:
         self.level_canvas.pack(fill='x', padx=self.level_padx, pady=self.level_pady)
         self.level_bar = self.level_canvas.create_rectangle(0, 0, 0, self.level_height,
                                                           fill='white', width=0)
+        # Latest level from the audio thread and the pending redraw that will apply it
+        self._pending_level = 0.0
+        self._level_job: Optional[str] = None
+        self._level_canvas_width = 1  # Kept current by <Configure>, avoids winfo_width() per redraw
+        self.level_canvas.bind('<Configure>', self._on_level_canvas_configure)
 
         # Add pulsing state variables
         self.pulsing = False
         self.RECORDING_COLORS = ['red', 'darkred']
         self.pulse_colors = self.RECORDING_COLORS
         self.current_color = 0
+        self._pulse_job: Optional[str] = None  # Pending after() id of the next _pulse tick
+        # Bound callables used on every pulse tick, looked up once
+        self._tk_call = self.root.tk.call
+        self._after = self.root.after
+        # Last status applied by update_status; cleared whenever another method changes
+        # the indicator, so only back-to-back identical updates are skipped
+        self._last_status: Optional[tuple] = None
 
         # Add click callback placeholder
         self.on_click_callback = None
@@ -72,10 +104,18 @@ class UIFeedback:
 
         # Bind click events
         self.label.bind('<Button-1>', self._handle_click)
-        self.indicator.bind('<Button-1>', self._handle_click)
+        self.root.bind('<Button-1>', self._handle_click)
         self.level_canvas.bind('<Button-1>', self._handle_click)
 
+        # Re-fit the window when the label's size changes (text, font, padding).
+        # Callers that add or remove widgets call _snap_to_content() themselves.
+        self._snapped_size: Optional[Tuple[int, int]] = None
+        self._snap_job: Optional[str] = None  # Pending after_idle() id of _apply_snap
+        self.label.bind('<Configure>', self._on_content_configure)
+
         # Position window initially
+        self._mon_cache: Optional[Tuple[Tuple[int, int], Tuple[int, int, int, int]]] = None
+        self._positioned_for: Optional[tuple] = None  # Inputs of the last placement
         self._position_window()
 
         # Add warning state variables
@@ -85,6 +125,12 @@ class UIFeedback:
         # Update label text color to be more visible on warning background
         self.label.configure(fg='black')  # Will be dynamically changed based on state
 
+        # Text insertion runs on a dedicated worker so the clipboard and key simulation
+        # never block the caller (or the Tk thread); queued texts are pasted in order
+        self._paste_queue: "queue.Queue[str]" = queue.Queue()
+        self._paste_thread = threading.Thread(target=self._paste_worker, daemon=True)
+        self._paste_thread.start()
+
     def _configure_size_attributes(self) -> None:
         """Sets UI dimension attributes based on self.size."""
         if self.size == 'mini':
@@ -107,24 +153,31 @@ class UIFeedback:
             self.label_text = "🎤 Recording (click to cancel)"
 
     def _position_window(self) -> None:
-        """Positions the indicator window based on the configured corner."""
-        self.indicator.update_idletasks()
-        win_w = self.indicator.winfo_width()
-        win_h = self.indicator.winfo_height()
-
-        monitor_geometry = get_primary_monitor_geometry()
-
-        # Default coordinates if monitor info fails
-        if monitor_geometry:
-            mon_x = monitor_geometry.left
-            mon_y = monitor_geometry.top
-            mon_w = monitor_geometry.width
-            mon_h = monitor_geometry.height
+        """
+        Positions the indicator window based on the configured corner.
+        Does nothing when the corner, monitor area and window size are the same as for
+        the last placement; Tk keeps the position while the window is withdrawn.
+        """
+        if self._snapped_size is not None:
+            # The window is sized by _snap_to_content, so its size is already known
+            win_w, win_h = self._snapped_size
         else:
-            mon_x = 0
-            mon_y = 0
-            mon_w = self.root.winfo_screenwidth()
-            mon_h = self.root.winfo_screenheight()
+            # Before the first snap, use the geometry manager's request without forcing a
+            # layout pass. Only a mapped window still reporting Tk's 1x1 placeholder
+            # needs the flush; _apply_snap repositions once the real size is known.
+            win_w = self.root.winfo_reqwidth()
+            win_h = self.root.winfo_reqheight()
+            if win_w <= 1 and self.root.winfo_ismapped():
+                self.root.update_idletasks()
+                win_w = self.root.winfo_reqwidth()
+                win_h = self.root.winfo_reqheight()
+
+        area = self._get_monitor_area()
+        placement = (self.position, area, win_w, win_h)
+        if placement == self._positioned_for:
+            return
+        self._positioned_for = placement
+        mon_x, mon_y, mon_w, mon_h = area
 
         margin = 15
         taskbar_offset = 40  # Offset to clear the Windows taskbar
@@ -143,7 +196,26 @@ class UIFeedback:
         else:  # top
             pos_y = mon_y + margin
 
-        self.indicator.geometry(f'+{pos_x}+{pos_y}')
+        self.root.geometry(f'+{pos_x}+{pos_y}')
+
+    def _get_monitor_area(self) -> Tuple[int, int, int, int]:
+        """
+        Returns (x, y, width, height) of the primary monitor, cached between calls.
+        The cache is keyed on Tk's screen size, which Tk refreshes on display changes
+        (resolution, primary monitor), so the Win32 query only reruns after one.
+        """
+        screen = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        if self._mon_cache is None or self._mon_cache[0] != screen:
+            monitor_geometry = get_primary_monitor_geometry()
+
+            # Default coordinates if monitor info fails
+            if monitor_geometry:
+                area = (monitor_geometry.left, monitor_geometry.top,
+                        monitor_geometry.width, monitor_geometry.height)
+            else:
+                area = (0, 0, screen[0], screen[1])
+            self._mon_cache = (screen, area)
+        return self._mon_cache[1]
 
     # Public method to allow position change at runtime
     def set_position(self, position: str) -> None:
@@ -157,6 +229,7 @@ class UIFeedback:
         """Update the indicator size and reconfigure UI elements."""
         valid_sizes = {'normal', 'mini'}
         if size in valid_sizes and self.size != size:
+            self._last_status = None
             self.size = size
 
             # Reconfigure dimensions based on new size
@@ -174,30 +247,58 @@ class UIFeedback:
             if '🎤 Recording' in current_text:
                 self.label.configure(text=self.label_text)
 
-            # Reposition window with new size
-            self._position_window()
+            # Fit the window to the new size; this repositions it when the size changed
+            self._snap_to_content()
 
     def update_audio_level(self, level: float) -> None:
         """Update the audio level indicator (level should be between 0.0 and 1.0)"""
         if self.pulsing:  # Only update when recording
-            width = self.level_canvas.winfo_width()
-            bar_width = int(width * min(1.0, max(0.0, level)))
+            # Called from the audio thread: just record the level, and schedule a redraw
+            # only if none is pending, so bursts collapse into one canvas update
+            self._pending_level = level
+            if self._level_job is None:
+                self._level_job = self.root.after(LEVEL_REFRESH_MS, self._apply_level)
+
+    def _apply_level(self) -> None:
+        """Draw the most recent level reported by update_audio_level"""
+        self._level_job = None  # Cleared first so a level arriving now schedules a new redraw
+        if self.pulsing:
+            bar_width = int(self._level_canvas_width * min(1.0, max(0.0, self._pending_level)))
             self.level_canvas.coords(self.level_bar, 0, 0, bar_width, self.level_height)
 
+    def _on_level_canvas_configure(self, event: tk.Event) -> None:
+        self._level_canvas_width = event.width
+
     def _pulse(self) -> None:
+        self._pulse_job = None
         if self.pulsing:
-            self.current_color = (self.current_color + 1) % 2
+            self.current_color ^= 1
             color = self.pulse_colors[self.current_color]
-            self.indicator.configure(bg=color)
-            self.frame.configure(bg=color)
-            self.label.configure(bg=color)
-            self.indicator.after(500, self._pulse)  # Pulse every 500ms
+            if color != self._applied_bg:
+                # Inlined _set_colors(color): background only
+                self._tk_call(self._recolor_cmd, color)
+                self._applied_bg = color
+            self._pulse_job = self._after(500, self._pulse)  # Pulse every 500ms
+
+    def _start_pulse(self) -> None:
+        """Start pulsing, replacing any running pulse chain rather than adding a second one"""
+        self._cancel_pulse()
+        self.pulsing = True
+        self._pulse()
+
+    def _cancel_pulse(self) -> None:
+        """Stop pulsing and drop the scheduled tick, so no stray callback runs afterwards"""
+        self.pulsing = False
+        if self._pulse_job is not None:
+            self.root.after_cancel(self._pulse_job)
+            self._pulse_job = None
 
     def start_listening_animation(self) -> None:
         """Start the recording animation"""
+        self._last_status = None
         # Cancel any existing warning state
         if self.warning_timer:
-            self.indicator.after_cancel(self.warning_timer)
+            self.root.after_cancel(self.warning_timer)
             self.warning_timer = None
 
         self.pulse_colors = self.RECORDING_COLORS
@@ -207,25 +308,34 @@ class UIFeedback:
         )
         self.level_canvas.pack(fill='x', padx=self.level_padx, pady=self.level_pady)
         self._position_window()
-        self.indicator.deiconify()
-        self.pulsing = True
-        self._pulse()
+        self.root.deiconify()
+        self._start_pulse()
         self._snap_to_content()
 
     def stop_listening_animation(self) -> None:
         """Stop the recording animation"""
-        self.pulsing = False
+        self._last_status = None
+        self._cancel_pulse()
         # Only hide if no warning is active
         if not self.warning_timer:
-            self.indicator.withdraw()
+            self.root.withdraw()
         # Reset colors to recording state
         self.current_color = 0
-        self.indicator.configure(bg=self.RECORDING_COLORS[0])
-        self.frame.configure(bg=self.RECORDING_COLORS[0])
-        self.label.configure(bg=self.RECORDING_COLORS[0])
+        self._set_colors(self.RECORDING_COLORS[0])
         # Reset audio level
         self.level_canvas.coords(self.level_bar, 0, 0, 0, self.level_height)
 
+    def _set_colors(self, bg: str, fg: Optional[str] = None, text: Optional[str] = None) -> None:
+        """Set the background of the window, frame and label, and optionally the label's
+        text color and text, with one Tcl call instead of three configure() round trips"""
+        options = []
+        if fg is not None:
+            options += ('-fg', fg)
+        if text is not None:
+            options += ('-text', text)
+        self.root.tk.call(self._recolor_cmd, bg, *options)
+        self._applied_bg = bg
+
     def _handle_click(self, event: tk.Event) -> None:
         if self.retry_available and self.on_retry_callback:
             self.retry_available = False
@@ -242,92 +352,117 @@ class UIFeedback:
         self.on_retry_callback = callback
 
     def insert_text(self, text: str) -> None:
+        """Queue text for insertion at the current cursor position (see _paste_text)"""
+        self._paste_queue.put(text)
+
+    def _paste_worker(self) -> None:
+        """Pastes queued texts one at a time for the lifetime of the app"""
+        while True:
+            text = self._paste_queue.get()
+            # Never let one failure end the worker, or every later insert would be dropped
+            try:
+                self._paste_text(text)
+            except Exception as e:
+                print(f"UIFeedback: Error during text insertion: {str(e)}")
+
+    def _paste_text(self, text: str) -> None:
+        """Insert text at the current cursor position, leaving the user's clipboard untouched"""
+        # On Windows single-line text is typed directly as Unicode key events; otherwise
+        # (multi-line text, other platforms, or input Windows rejected) paste it through
+        # the clipboard so line breaks arrive as text rather than Enter presses
+        if inject_unicode(text):
+            return
+        self._paste_via_clipboard(text)
+
+    def _paste_via_clipboard(self, text: str) -> None:
         """Insert text at the current cursor position using clipboard while preserving original clipboard content"""
         try:
+            import pyautogui
+            import pyperclip
+
             with self.pyautogui_lock:
                 # Save original clipboard content
                 original_clipboard = pyperclip.paste()
 
                 # Copy new text and paste it
                 pyperclip.copy(text)
-                pyautogui.hotkey('ctrl', 'v')
-
-                # Restore original clipboard content after a small delay (non-blocking)
-                self.root.after(100, lambda: pyperclip.copy(original_clipboard))
+                # Native Ctrl+V on Windows skips pyautogui's per-call pause
+                if not send_paste_shortcut():
+                    pyautogui.hotkey('ctrl', 'v')
+
+                # Restore original clipboard content after a small delay. This runs on the
+                # paste worker, so waiting here blocks no one, and the next queued text can't
+                # capture our text as its "original" clipboard before the restore happens
+                time.sleep(0.1)
+                pyperclip.copy(original_clipboard)
         except Exception as e:
             print(f"UIFeedback: Error during text insertion: {str(e)}")
 
     def show_warning(self, message: str, duration_ms: int = 5000) -> None:
         """Show a warning message in the indicator for a specified duration"""
+        self._last_status = None
         # Cancel any existing warning timer
         if self.warning_timer:
-            self.indicator.after_cancel(self.warning_timer)
+            self.root.after_cancel(self.warning_timer)
 
         # Update appearance for warning state
-        self.indicator.deiconify()
-        self.indicator.configure(bg=self.warning_color)
-        self.frame.configure(bg=self.warning_color)
-        self.label.configure(
-            bg=self.warning_color,
-            fg='black',  # Dark text for warning state
-            text=message
-        )
+        self.root.deiconify()
+        self._set_colors(self.warning_color, fg='black', text=message)  # Dark text for warning state
         self._position_window()
-        self._snap_to_content()
 
         # Hide the level indicator during warning
         self.level_canvas.pack_forget()
+        self._snap_to_content()
 
         # Schedule auto-dismiss
-        self.warning_timer = self.indicator.after(
+        self.warning_timer = self.root.after(
             duration_ms,
             self._reset_and_hide
         )
 
     def show_error_with_retry(self, message: str, duration_ms: int = 7000) -> None:
         """Show error message with retry option"""
+        self._last_status = None
         # Cancel any existing warning timer
         if self.warning_timer:
-            self.indicator.after_cancel(self.warning_timer)
+            self.root.after_cancel(self.warning_timer)
 
         self.retry_available = True
 
         # Update appearance for error state
-        self.indicator.deiconify()
-        self.indicator.configure(bg=self.warning_color)
-        self.frame.configure(bg=self.warning_color)
-        self.label.configure(
-            bg=self.warning_color,
-            fg='black',
-            text=f"{message}\n🔄 Click to retry"
-        )
+        self.root.deiconify()
+        self._set_colors(self.warning_color, fg='black', text=f"{message}\n🔄 Click to retry")
         self._position_window()
 
         # Hide the level indicator during warning
         self.level_canvas.pack_forget()
+        self._snap_to_content()
 
         # Schedule auto-dismiss
-        self.warning_timer = self.indicator.after(
+        self.warning_timer = self.root.after(
             duration_ms,
             self._reset_and_hide
         )
 
     def _reset_and_hide(self) -> None:
         """Reset UI state and hide the indicator"""
+        self._last_status = None
         self.warning_timer = None
         self.retry_available = False
         self.level_canvas.pack(fill='x', padx=self.level_padx, pady=self.level_pady)  # Restore level indicator
-        self.indicator.withdraw()
+        self.root.withdraw()
         # Reset to recording state colors
-        self.indicator.configure(bg=self.RECORDING_COLORS[0])
-        self.frame.configure(bg=self.RECORDING_COLORS[0])
-        self.label.configure(
-            bg=self.RECORDING_COLORS[0],
-            fg='white'  # Reset to white text for recording state
-        )
+        self._set_colors(self.RECORDING_COLORS[0], fg='white')  # White text for recording state
 
     def update_status(self, config: StatusConfig, error_message: Optional[str] = None) -> None:
         """Update UI appearance based on status configuration"""
+        # Nothing to do if this exact status is already applied. Errors always go through
+        # so a repeated error restarts its auto-hide timer.
+        status_key = (config.ui_color, config.ui_text, config.ui_fg_color, config.pulse, error_message)
+        if error_message is None and status_key == self._last_status:
+            return
+        self._last_status = status_key
+
         # Update colors and text
         text = error_message if error_message else config.ui_text
 
@@ -335,32 +470,29 @@ class UIFeedback:
         if self.size == 'mini' and config.ui_text == "🎤 Recording (click to cancel)":
             text = "🎤 Recording"
 
-        self.indicator.configure(bg=config.ui_color)
-        self.frame.configure(bg=config.ui_color)
-        self.label.configure(
-            bg=config.ui_color,
-            fg=config.ui_fg_color,
-            text=text
-        )
+        self._set_colors(config.ui_color, fg=config.ui_fg_color, text=text)
 
         # Handle visibility and animation
         if config.pulse:
             self.pulse_colors = [config.ui_color, self._darken_color(config.ui_color)]
-            self.indicator.deiconify()
-            self.pulsing = True
-            self._pulse()
+            self.root.deiconify()
+            self._start_pulse()
         else:
-            self.pulsing = False
+            self._cancel_pulse()
             if error_message:
-                self.indicator.deiconify()
+                self.root.deiconify()
                 # Auto-hide after 5 seconds for errors
                 if self.warning_timer:
-                    self.indicator.after_cancel(self.warning_timer)
-                self.warning_timer = self.indicator.after(5000, self._reset_and_hide)
+                    self.root.after_cancel(self.warning_timer)
+                self.warning_timer = self.root.after(5000, self._reset_and_hide)
             else:
-                self.indicator.withdraw()
+                self.root.withdraw()
+
+        self._snap_to_content()
 
-    def _darken_color(self, color: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=32)  # Only a handful of status colors ever pass through here
+    def _darken_color(color: str) -> str:
         """Create a darker version of the given color for pulsing effect"""
         try:
             # Handle invalid or empty color values
@@ -384,35 +516,55 @@ class UIFeedback:
 
     def cleanup(self) -> None:
         """Ensure proper cleanup of UI resources"""
-        if self.warning_timer:
-            self.indicator.after_cancel(self.warning_timer)
-        self.pulsing = False
-        self.indicator.withdraw()
+        self._last_status = None
+        self._cancel_pulse()  # Also stops update_audio_level from scheduling new redraws
+        # Cancel every pending timer so nothing fires while (or after) the loop shuts down
+        for job_attr in ('warning_timer', '_snap_job', '_level_job'):
+            job = getattr(self, job_attr)
+            if job is not None:
+                self.root.after_cancel(job)
+                setattr(self, job_attr, None)
+        self.root.withdraw()
         self.root.quit()
 
 
+    def _on_content_configure(self, event: tk.Event) -> None:
+        self._snap_to_content()
+
     def _snap_to_content(self) -> None:
         """
-        Continuously adjusts the window size to fit its content.
-        Forces the window to "shrink-wrap" its contents by continuously measuring the
-        required space and resizing the window to match. This prevents "mysterious margins".
+        Schedules _apply_snap for the next idle pass. Called whenever the content
+        changes; several changes in a row (e.g. colors, text and level bar during one
+        state transition) collapse into a single resize.
+        """
+        if self._snap_job is None:
+            self._snap_job = self.root.after_idle(self._apply_snap)
+
+    def _apply_snap(self) -> None:
+        """
+        Adjusts the window size to fit its content.
+        Forces the window to "shrink-wrap" its contents by measuring the required space
+        and resizing the window to match. This prevents "mysterious margins".
         """
+        self._snap_job = None
         try:
-            self.indicator.update_idletasks()
-            w = self.indicator.winfo_reqwidth()
-            h = self.indicator.winfo_reqheight()
-            self.indicator.geometry(f"{w}x{h}")
-
-            # Schedule the next check
-            if self.pulsing or self.warning_timer:
-                self.indicator.after(100, self._snap_to_content)
+            self.root.update_idletasks()
+            size = (self.root.winfo_reqwidth(), self.root.winfo_reqheight())
+            # Only touch the geometry when the size actually changed; this also stops the
+            # resulting <Configure> from re-triggering a resize
+            if size != self._snapped_size:
+                self._snapped_size = size
+                self.root.geometry(f"{size[0]}x{size[1]}")
+                # Keep right/bottom/center anchored corners in place after a resize
+                self._position_window()
         except tk.TclError:
-            # This can happen if the window is destroyed while the after() call is pending
+            # This can happen if the window is being destroyed
             pass
 
 
 if __name__ == "__main__":
     import time
+    from pynput import keyboard
 
     class UITester:
         def __init__(self) -> None:
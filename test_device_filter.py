@@ -10,11 +10,11 @@ print("IMPROVED DEVICE LIST (what the app will show in tray)")
 print("=" * 80)
 
 devices = get_input_devices()
+hostapis = sd.query_hostapis()  # One PortAudio call for all host APIs
 print(f"\nTotal devices after filtering: {len(devices)}\n")
 
 for device in sorted(devices, key=lambda d: d['name'].lower()):
-    api_info = sd.query_hostapis(device['hostapi'])
-    api_name = api_info['name']
+    api_name = hostapis[device['hostapi']]['name']
     priority = _get_host_api_priority(device['hostapi'])
     
     print(f"ID: {device['id']:>3}  Priority: {priority}  API: {api_name:>20}")
@@ -13,29 +13,42 @@ duration = 2
 samplerate = 22050
 channels = 3
 
-print(f"Recording {duration}s from 3-channel device...")
-
-# Record multi-channel
-recording = sd.rec(int(duration * samplerate), samplerate=samplerate, channels=channels, dtype=np.int16)
-sd.wait()
-
-print(f"Recording shape: {recording.shape}")
-print(f"Max amplitude: {np.max(np.abs(recording))}")
+filename = 'test_mono.wav'
+blocksize = 1024
 
-# Convert to mono like the recorder does
-if recording.ndim > 1 and recording.shape[1] > 1:
-    mono_data = np.mean(recording, axis=1)
-else:
-    mono_data = recording.flatten() if recording.ndim > 1 else recording
+# Per-block scratch buffers, allocated once and reused by every callback
+mix = np.empty(blocksize, dtype=np.int32)
+mono = np.empty(blocksize, dtype=np.int16)
+stats = {'frames': 0, 'max_amplitude': 0}
 
-print(f"Mono data shape: {mono_data.shape}")
-print(f"Mono data dtype: {mono_data.dtype}")
+print(f"Recording {duration}s from 3-channel device...")
 
-# Write to file
-filename = 'test_mono.wav'
+# Stream straight into the file, downmixing each block in place like the recorder
+# does, instead of holding the whole multi-channel recording plus a mono copy
 with sf.SoundFile(filename, mode='w', samplerate=samplerate, channels=1, subtype='PCM_16', format='WAV') as f:
-    f.write(mono_data)
-
+    def callback(indata, frames, time_info, status):
+        if status:
+            print(f"Stream status: {status}")
+        block_mix = mix[:frames]
+        block_mono = mono[:frames]
+        if indata.shape[1] == 2:
+            np.add(indata[:, 0], indata[:, 1], out=block_mix, dtype=np.int32)
+            np.right_shift(block_mix, 1, out=block_mix)
+        else:
+            np.add.reduce(indata, axis=1, dtype=np.int32, out=block_mix)
+            np.floor_divide(block_mix, indata.shape[1], out=block_mix)
+        np.copyto(block_mono, block_mix, casting='unsafe')
+        f.write(block_mono)
+
+        stats['frames'] += frames
+        stats['max_amplitude'] = max(stats['max_amplitude'], int(np.abs(indata).max()))
+
+    with sd.InputStream(samplerate=samplerate, channels=channels, dtype='int16',
+                        blocksize=blocksize, callback=callback):
+        sd.sleep(int(duration * 1000))
+
+print(f"Recorded frames: {stats['frames']} x {channels} channels")
+print(f"Max amplitude: {stats['max_amplitude']}")
 print(f"Written to {filename}")
 
 # Try to read it back
@@ -1,5 +1,7 @@
 import sys
 import os
+import signal
+import threading
 import traceback
 
 # Add the current directory to the path so we can import modules
@@ -15,7 +17,17 @@ try:
     print("App created successfully")
     
     print("App should be running now. Check system tray for icon.")
-    input("Press Enter to exit...")
+    print("Press Ctrl+C to exit...")
+
+    # Park on an event set by the SIGINT handler rather than blocking in input().
+    # The short timeout keeps the wait interruptible on Windows.
+    shutdown_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: shutdown_event.set())
+    while not shutdown_event.wait(0.5):
+        pass
+
+    print("Shutting down...")
+    app.cleanup()
     
 except Exception as e:
     print(f"Error occurred: {e}")
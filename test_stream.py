@@ -18,9 +18,11 @@ try:
         def cb(indata, frames, time, status):
             if status:
                 print(f"Stream status: {status}")
-            f.write(indata.copy())
+            # indata stays valid for the whole callback and the write is synchronous,
+            # so the samples can go straight to the file without a copy
+            f.buffer_write(indata, dtype="int16")
         
-        with sd.InputStream(device=dev_id, samplerate=sr, channels=1, callback=cb):
+        with sd.InputStream(device=dev_id, samplerate=sr, channels=1, dtype="int16", callback=cb):
             print("Recording for 2 seconds... speak now!")
             sd.sleep(2000)
     
@@ -23,7 +23,7 @@ from modules.settings import Settings
 from modules.transcribe import transcribe_audio
 from modules.tray import setup_tray_icon
 from modules.ui import UIFeedback
-from modules.audio_manager import set_input_device, get_default_device_id, DeviceIdentifier, find_device_by_identifier
+from modules.audio_manager import set_input_device, get_default_device_id, DeviceIdentifier, find_device_by_identifier, invalidate_device_cache
 from modules.status_manager import StatusManager, AppStatus
 from modules.screen_utils import set_process_dpi_awareness, hide_console_window
 from modules.logger import setup_logging
@@ -129,20 +129,9 @@ class VoiceTypingApp:
                     self.middle_button_press_time = datetime.now().timestamp()
                     self.long_press_triggered = False
 
-                    def check_long_press():
-                        # This runs after long_press_threshold seconds
-                        if not self.long_press_triggered:
-                            self.long_press_triggered = True
-                            self.logger.info("Middle button long-press detected, sending Enter")
-
-                            # Send Enter key using pynput
-                            keyboard_controller = pynput_keyboard.Controller()
-                            keyboard_controller.press(pynput_keyboard.Key.enter)
-                            keyboard_controller.release(pynput_keyboard.Key.enter)
-
-                    # Schedule long-press check
+                    # Schedule long-press check (a bound method, so no closure per press)
                     delay_ms = int(self.long_press_threshold * 1000)
-                    self.long_press_timer = self.ui_feedback.root.after(delay_ms, check_long_press)
+                    self.long_press_timer = self.ui_feedback.root.after(delay_ms, self._check_long_press)
 
                 else:
                     # Button released
@@ -165,6 +154,18 @@ class VoiceTypingApp:
 
         self.mouse_listener = mouse.Listener(on_click=on_mouse_click)
 
+    def _check_long_press(self) -> None:
+        """Runs long_press_threshold seconds after a middle button press"""
+        self.long_press_timer = None
+        if not self.long_press_triggered:
+            self.long_press_triggered = True
+            self.logger.info("Middle button long-press detected, sending Enter")
+
+            # Send Enter key using pynput
+            keyboard_controller = pynput_keyboard.Controller()
+            keyboard_controller.press(pynput_keyboard.Key.enter)
+            keyboard_controller.release(pynput_keyboard.Key.enter)
+
     def _initialize_microphone(self) -> None:
         """Initialize microphone device from settings or default"""
         try:
@@ -226,8 +227,9 @@ class VoiceTypingApp:
 
     def refresh_microphones(self) -> None:
         """Refresh the microphone list and update the tray menu"""
+        invalidate_device_cache()
         if self.update_icon_menu:
-            self.update_icon_menu()
+            self.update_icon_menu('mic')
 
     def toggle_recording(self) -> None:
         if not self.recording:
@@ -335,7 +337,7 @@ class VoiceTypingApp:
                 self.history.add(result)
                 self.ui_feedback.insert_text(result)
                 if self.update_icon_menu:
-                    self.update_icon_menu()
+                    self.update_icon_menu('history')
                 self.status_manager.set_status(AppStatus.IDLE)
                 # Log transcription result with preview
                 preview_len = 50
@@ -410,7 +412,7 @@ class VoiceTypingApp:
                 self.ui_feedback.show_warning("✅ Transcription copied to clipboard", 3000)
                 # Update the menu to reflect the new transcription in history
                 if self.update_icon_menu:
-                    self.update_icon_menu()
+                    self.update_icon_menu('history')
             else:
                 self.ui_feedback.show_error_with_retry("⚠️ Retry failed")
                 self.status_manager.set_status(AppStatus.ERROR)
@@ -529,6 +531,8 @@ class VoiceTypingApp:
             # We pass sys.argv to the new process to restart with the same arguments.
             # This is more reliable than os.startfile as it doesn't depend on file associations.
             self.logger.debug(f"Restarting with command: {[sys.executable] + sys.argv}")
+            # Persist pending settings (of every Settings instance) before the new instance reads them
+            Settings.flush_all()
             subprocess.Popen([sys.executable] + sys.argv)
 
             # Exit current instance